@@ -0,0 +1,279 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Exercise the server list with a large synthetic catalog.
+
+Rows are built by the app's own methods and shown in the real
+PvpnServerList widget. The script opens a country and checks it shows
+server rows. It then scrolls a country of 100 servers and one holding
+every server, at its top, middle and bottom, and reports frame times
+and how many row widgets were created.
+
+It also builds the list of every country and pages through it, and
+reports the build time and how many textures the row images use. Run
+`python setup.py build_atlas` (or remove images/atlas/) first to compare
+with (or without) atlases.
+
+Run from the repository root (needs kivy and protonvpn-cli):
+    python benchmarks/server_list.py [--servers 10000] [--pixels 10]
+"""
+
+# Standard Libraries
+import argparse
+from collections import Counter
+import os
+import random
+import sys
+from time import perf_counter
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Image paths in the app are relative to the package.
+os.chdir(os.path.join(ROOT, 'protonvpn_cli_gui'))
+
+# Kivy Libraries
+from kivy.base import EventLoop  # noqa
+from kivy.core.window import Window  # noqa
+from kivy.uix.image import Image  # noqa
+
+# Local
+from protonvpn_cli_gui import assets, widgets  # noqa
+from protonvpn_cli_gui.protonvpnguiapp import ProtonVpnGui  # noqa
+from protonvpn_cli_gui.server_catalog import ServerCatalog  # noqa
+
+ROW_CLASSES = (widgets.PvpnServerListCountryRow, widgets.PvpnServerListServerRow)
+# Row widgets created, by class name.
+created = Counter()
+
+
+def count_instances(cls):
+    """Count every widget of cls created from here on."""
+    init = cls.__init__
+
+    def counted_init(self, **kwargs):
+        created[cls.__name__] += 1
+        init(self, **kwargs)
+
+    cls.__init__ = counted_init
+
+
+class ServerListHarness(object):
+    """The app's server list methods, without the rest of the app."""
+
+    populate_server_tree = ProtonVpnGui.populate_server_tree
+    show_server_view = ProtonVpnGui.show_server_view
+    sync_server_view = ProtonVpnGui.sync_server_view
+    build_server_rows = ProtonVpnGui.build_server_rows
+
+    def __init__(self, server_catalog, server_list, tier=2):
+        self.tier = tier
+        self.server_catalog = server_catalog
+        self.server_list = server_list
+        self.secure_core = type('Switch', (), {
+            'disabled': tier < 2,
+            'state': 'normal',
+        })()
+        self.server_views = {
+            secure_core: {
+                'country_rows': {},
+                'countries': [],
+                'country_codes': {},
+            }
+            for secure_core in (False, True)
+        }
+
+
+def country_codes():
+    """Return country codes that have a flag image."""
+    flags = os.listdir('./images/flags/small')
+    return sorted(name.split('_')[0].upper() for name in flags)
+
+
+def synthetic_catalog(count, codes, seed=0):
+    """Return a ServerCatalog of count servers spread over codes."""
+    rng = random.Random(seed)
+    servers = []
+    for i in range(count):
+        code = codes[i % len(codes)]
+        servers.append({
+            'Name': f'{code}#{i}',
+            'EntryCountry': code,
+            'ExitCountry': code,
+            'City': 'City',
+            'Tier': rng.choice((0, 1, 2, 2)),
+            'Features': rng.choice((0, 0, 0, 2, 4)),
+            'Load': rng.randint(0, 100),
+            'Score': rng.random(),
+            'Status': 1,
+            'Servers': [{'EntryIP': '127.0.0.1'}],
+        })
+    return ServerCatalog(servers)
+
+
+def settle(frames=3):
+    """Run the event loop until layout and drawing are done."""
+    for _ in range(frames):
+        EventLoop.idle()
+
+
+def shown_row_classes(server_list):
+    return Counter(
+        type(view).__name__ for view in server_list.layout_manager.children
+    )
+
+
+def new_server_list():
+    Window.size = (800, 600)
+    server_list = widgets.PvpnServerList(size_hint=(1, 1))
+    Window.add_widget(server_list)
+    settle()
+    return server_list
+
+
+def check_open_country(codes):
+    """Open a country and return the row classes shown."""
+    server_list = new_server_list()
+    harness = ServerListHarness(
+        synthetic_catalog(len(codes) * 20, codes),
+        server_list,
+    )
+    harness.populate_server_tree(server_list, harness.server_catalog)
+    settle()
+    country = server_list.country_rows[0]['country_name']
+    server_list.toggle_country(country)
+    settle()
+    shown = shown_row_classes(server_list)
+    Window.remove_widget(server_list)
+    return country, shown
+
+
+def shown_textures(server_list):
+    """Return the GL ids of the textures shown by row images."""
+    textures = set()
+    for view in server_list.layout_manager.children:
+        for widget in view.walk():
+            if isinstance(widget, Image) and widget.texture:
+                # Atlas regions share their atlas's id.
+                textures.add(widget.texture.id)
+    return textures
+
+
+def check_textures(codes):
+    """
+    Build the list of every country and page through it. Returns the
+    build time (seconds), the time to page through the list and the
+    textures used by row images.
+    """
+    server_list = new_server_list()
+    harness = ServerListHarness(
+        synthetic_catalog(len(codes) * 20, codes),
+        server_list,
+    )
+    started = perf_counter()
+    harness.populate_server_tree(server_list, harness.server_catalog)
+    settle()
+    build_time = perf_counter() - started
+    textures = shown_textures(server_list)
+    scrollable = server_list.layout_manager.height - server_list.height
+    started = perf_counter()
+    offset = 0
+    while offset < scrollable:
+        offset = min(scrollable, offset + server_list.height)
+        server_list.scroll_y = 1 - offset / scrollable
+        settle()
+        textures |= shown_textures(server_list)
+    page_time = perf_counter() - started
+    Window.remove_widget(server_list)
+    return build_time, page_time, textures
+
+
+def check_scroll(count, frames, pixels):
+    """
+    Scroll a country of count servers by `pixels` a frame, for `frames`
+    frames each at its top, middle and bottom. Returns the frame times
+    (seconds).
+    """
+    server_list = new_server_list()
+    harness = ServerListHarness(synthetic_catalog(count, ['CH']), server_list)
+    harness.populate_server_tree(server_list, harness.server_catalog)
+    settle()
+    server_list.toggle_country(server_list.country_rows[0]['country_name'])
+    settle()
+    scrollable = server_list.layout_manager.height - server_list.height
+    created.clear()
+    frame_times = []
+    for start in (0, scrollable / 2, scrollable - frames * pixels):
+        # Jumping there isn't timed.
+        server_list.scroll_y = 1 - start / scrollable
+        settle()
+        for frame in range(1, frames + 1):
+            offset = start + frame * pixels
+            started = perf_counter()
+            server_list.scroll_y = 1 - offset / scrollable
+            EventLoop.idle()
+            frame_times.append(perf_counter() - started)
+    Window.remove_widget(server_list)
+    return frame_times
+
+
+def report_scroll(count, frames, pixels):
+    frame_times = sorted(check_scroll(count, frames, pixels))
+    median = frame_times[len(frame_times) // 2] * 1000
+    p95 = frame_times[len(frame_times) * 95 // 100] * 1000
+    slowest = frame_times[-1] * 1000
+    print(
+        f'{count:>6} server rows: median {median:.2f} ms, 95th percentile '
+        f'{p95:.2f} ms, max {slowest:.2f} ms per frame; row widgets '
+        f'created while scrolling: {sum(created.values())}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--servers', type=int, default=10000)
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--pixels', type=int, default=10)
+    args = parser.parse_args()
+
+    EventLoop.ensure_window()
+    for cls in ROW_CLASSES:
+        count_instances(cls)
+    codes = country_codes()
+
+    country, shown = check_open_country(codes)
+    print(f'Opened {country}: rows shown {dict(shown)}')
+    if not shown['PvpnServerListServerRow']:
+        sys.exit('FAIL: the open country shows no server rows')
+
+    build_time, page_time, textures = check_textures(codes)
+    print(
+        f'{len(codes)} countries, atlases '
+        f'{"used" if assets._regions else "not built"}: built in '
+        f'{build_time * 1000:.0f} ms, paged through in '
+        f'{page_time * 1000:.0f} ms; row images use {len(textures)} textures'
+    )
+
+    print(f'Scrolling {args.pixels} px a frame:')
+    for count in (100, args.servers):
+        report_scroll(count, args.frames, args.pixels)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+"""
+Count the widgets a server list refresh creates.
+
+A synthetic server list is shown, then refreshed with new loads and a
+few servers added and removed, as an API pull does. Every Kivy widget
+created is counted, for the first build and per refresh.
+
+With --rev, the same measurement runs against the code at a git
+revision, e.g., the server tree before it was refreshed in place:
+    python benchmarks/server_refresh.py --rev 3a9cd18^
+
+Run from the repository root (needs kivy and protonvpn-cli):
+    python benchmarks/server_refresh.py [--servers 2000] [--refreshes 5]
+"""
+
+# Standard Libraries
+import argparse
+from collections import Counter
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--servers', type=int, default=2000)
+    parser.add_argument('--countries', type=int, default=60)
+    parser.add_argument('--refreshes', type=int, default=5)
+    parser.add_argument('--rev', help='measure the code at this revision')
+    parser.add_argument('--root', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def run_at_revision(rev, argv):
+    """Re-run this script against a copy of the tree at rev."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        archive = subprocess.run(
+            ['git', 'archive', rev],
+            cwd=root,
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+        subprocess.run(
+            ['tar', '-x', '-C', tmp_dir],
+            input=archive.stdout,
+            check=True,
+        )
+        args = [arg for arg in argv if not arg.startswith('--rev')]
+        if rev in args:
+            args.remove(rev)
+        return subprocess.call(
+            [sys.executable, os.path.abspath(__file__), '--root', tmp_dir]
+            + args
+        )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def synthetic_servers(count, codes, rng):
+    """Return count raw server dicts, as pvpncli_utils.get_servers() does."""
+    return [
+        {
+            'Name': f'{codes[i % len(codes)]}#{i}',
+            'EntryCountry': codes[i % len(codes)],
+            'ExitCountry': codes[i % len(codes)],
+            'City': 'City',
+            'Tier': rng.choice((0, 1, 2, 2)),
+            'Features': rng.choice((0, 0, 0, 2, 4)),
+            'Load': rng.randint(0, 100),
+            'Score': rng.random(),
+            'Status': 1,
+            'Servers': [{'EntryIP': '127.0.0.1'}],
+        }
+        for i in range(count)
+    ]
+
+
+def next_pull(servers, codes, rng, churn=0.01):
+    """Return servers as a later pull: new loads, a few servers swapped."""
+    servers = [dict(server, Load=rng.randint(0, 100)) for server in servers]
+    swapped = max(1, int(len(servers) * churn))
+    for i in rng.sample(range(len(servers)), swapped):
+        code = codes[i % len(codes)]
+        servers[i] = dict(servers[i], Name=f'{code}#new{rng.random()}')
+    return servers
+
+
+def main():
+    args = parse_args()
+    if args.rev:
+        sys.exit(run_at_revision(args.rev, sys.argv[1:]))
+
+    root = args.root or os.path.dirname(
+        os.path.dirname(os.path.abspath(__file__))
+    )
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+    sys.path.insert(0, root)
+    # Image paths in the app are relative to the package.
+    os.chdir(os.path.join(root, 'protonvpn_cli_gui'))
+
+    # Kivy Libraries
+    from kivy.base import EventLoop
+    from kivy.core.window import Window
+    from kivy.uix.boxlayout import BoxLayout
+    from kivy.uix.widget import Widget
+
+    # protonvpn-cli-ng Functions
+    from protonvpn_cli import country_codes as pvpncli_country_codes
+    from protonvpn_cli import utils as pvpncli_utils
+
+    # Local
+    from protonvpn_cli_gui.protonvpnguiapp import ProtonVpnGui
+
+    created = Counter()
+    widget_init = Widget.__init__
+
+    def counted_init(self, **kwargs):
+        created[type(self).__name__] += 1
+        widget_init(self, **kwargs)
+
+    Widget.__init__ = counted_init
+
+    EventLoop.ensure_window()
+    Window.size = (800, 600)
+    rng = random.Random(0)
+    codes = sorted(
+        code for code in pvpncli_country_codes.country_codes
+        if os.path.isfile(f'./images/flags/small/{code.lower()}_flag.png')
+    )[:args.countries]
+    pull = {'servers': synthetic_servers(args.servers, codes, rng)}
+
+    class Trigger(object):
+        def __call__(self, *args):
+            pass
+
+        def cancel(self):
+            pass
+
+    class Harness(object):
+        """The app's server list methods, without the rest of the app."""
+
+        def __init__(self):
+            self.tier = 2
+            self.secure_core = type('Switch', (), {
+                'disabled': False,
+                'state': 'normal',
+            })()
+
+        def update_current_connection(self, *dt):
+            pass
+
+    # Borrow every method, so helpers added in any revision are found.
+    for name, value in vars(ProtonVpnGui).items():
+        if callable(value) and not hasattr(Harness, name):
+            setattr(Harness, name, value)
+    harness = Harness()
+
+    if hasattr(ProtonVpnGui, 'sync_server_view'):
+        # RecycleView server list, fed a ServerCatalog.
+        from protonvpn_cli_gui import widgets
+        from protonvpn_cli_gui.server_catalog import ServerCatalog
+        harness.server_views = {
+            secure_core: {
+                'country_rows': {},
+                'countries': [],
+                'country_codes': {},
+            }
+            for secure_core in (False, True)
+        }
+        harness.server_list = widgets.PvpnServerList(size_hint=(1, 1))
+        Window.add_widget(harness.server_list)
+
+        def build():
+            refresh()
+
+        def refresh():
+            harness.server_catalog = ServerCatalog(pull['servers'])
+            harness.populate_server_tree(
+                harness.server_list,
+                harness.server_catalog,
+            )
+    else:
+        # TreeView server tree, fed by pvpncli_utils.get_servers().
+        panel = BoxLayout()
+        Window.add_widget(panel)
+        harness.ids = type('Ids', (), {})()
+        harness.ids.main_screen = type('Screen', (), {})()
+        harness.ids.main_screen.ids = type('Ids', (), {})()
+        harness.ids.main_screen.ids.countries_panel = panel
+        harness.update_server_tree = Trigger()
+        pvpncli_utils.pull_server_data = lambda force=False: None
+        pvpncli_utils.get_servers = lambda: pull['servers']
+        pvpncli_utils.get_country_name = (
+            lambda code: pvpncli_country_codes.country_codes.get(code, code)
+        )
+
+        def build():
+            harness.build_server_tree()
+
+        def refresh():
+            harness.update_server_tree_info()
+
+    def measure(step):
+        created.clear()
+        started = perf_counter()
+        step()
+        for _ in range(3):
+            EventLoop.idle()
+        return sum(created.values()), perf_counter() - started
+
+    widgets_built, build_time = measure(build)
+    print(
+        f'{args.servers} servers in {len(codes)} countries; first build: '
+        f'{widgets_built} widgets in {build_time:.2f}s'
+    )
+    per_refresh = []
+    for _ in range(args.refreshes):
+        pull['servers'] = next_pull(pull['servers'], codes, rng)
+        per_refresh.append(measure(refresh))
+    counts = sorted(count for count, _ in per_refresh)
+    times = sorted(seconds for _, seconds in per_refresh)
+    print(
+        f'Per refresh (new loads, 1% of servers replaced): '
+        f'{counts[len(counts) // 2]} widgets created (min {counts[0]}, max '
+        f'{counts[-1]}), median {times[len(times) // 2]:.2f}s'
+    )
+
+
+if __name__ == '__main__':
+    main()
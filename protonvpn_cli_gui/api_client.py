@@ -0,0 +1,179 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+import os
+import requests
+import threading
+from time import time
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import constants as pvpncli_constants
+from protonvpn_cli import logger as pvpncli_logger
+from protonvpn_cli import utils as pvpncli_utils
+
+# Local
+from .config_cache import pvpn_config
+from .server_catalog import ServerCatalog
+
+DEFAULT_API_DOMAIN = 'https://api.protonvpn.ch'
+# Code of a successful API response.
+API_SUCCESS = 1000
+LOGICALS_ENDPOINT = '/vpn/logicals'
+
+
+def api_session():
+    """Return a requests.Session with the headers the ProtonVPN API expects."""
+    session = requests.Session()
+    session.headers.update({
+        'x-pm-appversion': f'LinuxVPN_{pvpncli_constants.VERSION}',
+        'x-pm-apiversion': '3',
+        'Accept': 'application/vnd.protonmail.v1+json',
+    })
+    return session
+
+
+def api_url(endpoint, api_domain=None):
+    """Return the url of an API endpoint, on the configured api_domain."""
+    if api_domain is None:
+        try:
+            api_domain = pvpn_config.get('USER', 'api_domain')
+        except KeyError:
+            api_domain = DEFAULT_API_DOMAIN
+    return api_domain.rstrip('/') + endpoint
+
+
+class ServerListClient(object):
+    """
+    Fetch the server list (/vpn/logicals) over one pooled HTTP session.
+
+    Requests are conditional (If-None-Match / If-Modified-Since) once a
+    catalog has been fetched or restored from a snapshot, and a 304 reuses
+    that catalog instead of downloading and parsing the full payload again. Full responses are
+    written to the CLI's server info file, same as pull_server_data(), so
+    protonvpn-cli keeps using the same data.
+
+    The pull time is recorded in the CLI's config through `dispatch`, if
+    set, so the write happens on the UI thread with other config writes.
+    """
+
+    def __init__(self, session=None, api_domain=None, timeout=10,
+                 dispatch=None):
+        self.session = session or api_session()
+        self.api_domain = api_domain
+        self.timeout = timeout
+        self.dispatch = dispatch
+        self.catalog = None
+        self.etag = None
+        self.last_modified = None
+        # Totals for this session, reported in the debug log.
+        self.requests_sent = 0
+        self.not_modified = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+
+    def _conditional_headers(self):
+        # Without a catalog to fall back on, a 304 would be useless.
+        if self.catalog is None:
+            return {}
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def restore(self, catalog, etag=None, last_modified=None):
+        """Resume from a saved catalog and the validators it was fetched with."""
+        with self._lock:
+            if self.catalog is not None:
+                return
+            self.catalog = catalog
+            self.etag = etag
+            self.last_modified = last_modified
+
+    def fetch(self):
+        """
+        Return (catalog, changed) for the latest server list.
+
+        `changed` is False when the server answered 304 and the previously
+        fetched catalog was returned.
+        """
+        with self._lock:
+            response = self.session.get(
+                api_url(LOGICALS_ENDPOINT, self.api_domain),
+                headers=self._conditional_headers(),
+                timeout=self.timeout,
+            )
+            self.requests_sent += 1
+            self.bytes_received += len(response.content)
+            pulled_at = time()
+            if response.status_code == 304 and self.catalog is not None:
+                self.not_modified += 1
+                # A copy, since the UI thread may be reading the old one.
+                self.catalog = self.catalog.repulled(pulled_at)
+                changed = False
+            else:
+                response.raise_for_status()
+                payload = response.json()
+                # Same check as pvpn-cli's call_api().
+                if payload.get('Code') != API_SUCCESS:
+                    raise ValueError(
+                        f"API error {payload.get('Code')}: "
+                        f"{payload.get('Error', 'unknown error')}"
+                    )
+                # Offline servers are dropped, same as get_servers().
+                servers = [
+                    server for server in payload['LogicalServers']
+                    if server.get('Status', 1) == 1
+                ]
+                self.catalog = ServerCatalog(servers, pulled_at=pulled_at)
+                self.etag = response.headers.get('ETag')
+                self.last_modified = response.headers.get('Last-Modified')
+                self._write_server_info(response.content)
+                changed = True
+            if self.dispatch:
+                self.dispatch(self._mark_pulled, pulled_at)
+            else:
+                self._mark_pulled(pulled_at)
+            pvpncli_logger.logger.debug(
+                f"Server list {'updated' if changed else 'not modified'}: "
+                f"{self.requests_sent} requests, {self.not_modified} not "
+                f"modified, {self.bytes_received} bytes this session"
+            )
+            return self.catalog, changed
+
+    def _write_server_info(self, content):
+        """Save the raw payload where protonvpn-cli expects it."""
+        tmp_path = f'{pvpncli_constants.SERVER_INFO_FILE}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, pvpncli_constants.SERVER_INFO_FILE)
+        pvpncli_utils.change_file_owner(pvpncli_constants.SERVER_INFO_FILE)
+
+    def _mark_pulled(self, pulled_at):
+        """Record the pull so protonvpn-cli doesn't re-pull right away."""
+        try:
+            pvpncli_utils.set_config_value(
+                'metadata',
+                'last_api_pull',
+                int(pulled_at),
+            )
+            pvpn_config.invalidate()
+        # KeyError: no config file or metadata section yet (first run).
+        except (OSError, KeyError) as e:
+            print('Exception from ServerListClient: ', e)
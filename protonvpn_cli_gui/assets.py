@@ -0,0 +1,100 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+import glob
+import json
+import os
+
+IMAGES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'images',
+)
+ATLAS_DIR = os.path.join(IMAGES_DIR, 'atlas')
+
+# Images packed into each atlas by `python setup.py build_atlas` (run by
+# every package build), as glob patterns relative to IMAGES_DIR. Atlas region ids are the file names
+# without extension, so they must be unique within an atlas.
+ATLASES = {
+    'flags-small': ['flags/small/*.png'],
+    'icons': [
+        'connect-small-hover_150.png',
+        'connect-small_150.png',
+        'p2p-arrows.png',
+        'plus-server.png',
+        'tor-onion.png',
+        'widget-background-transparent.png',
+    ],
+}
+ATLAS_SIZE = 1024
+
+
+def atlas_images(name):
+    """Return the image files packed into atlas name."""
+    filenames = []
+    for pattern in ATLASES[name]:
+        filenames.extend(sorted(glob.glob(os.path.join(IMAGES_DIR, pattern))))
+    return filenames
+
+
+def build_atlases():
+    """Pack ATLASES into Kivy atlases under ATLAS_DIR."""
+    from kivy.atlas import Atlas
+
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+    for name in ATLASES:
+        filenames = atlas_images(name)
+        Atlas.create(os.path.join(ATLAS_DIR, name), filenames, ATLAS_SIZE)
+        print(f'Packed {len(filenames)} images into {name}.atlas')
+
+
+def _load_regions():
+    """Map './images/...' paths to atlas:// urls for built atlases."""
+    regions = {}
+    for name in ATLASES:
+        atlas_file = os.path.join(ATLAS_DIR, f'{name}.atlas')
+        try:
+            with open(atlas_file) as f:
+                pages = json.load(f)
+        except (OSError, ValueError):
+            # Not built; images load from their own files.
+            continue
+        packed = set()
+        for page in pages.values():
+            packed.update(page)
+        for filename in atlas_images(name):
+            region = os.path.splitext(os.path.basename(filename))[0]
+            if region not in packed:
+                continue
+            path = os.path.relpath(filename, IMAGES_DIR)
+            regions[f'./images/{path}'] = (
+                f'atlas://{os.path.join(ATLAS_DIR, name)}/{region}'
+            )
+    return regions
+
+
+_regions = _load_regions()
+
+
+def image_source(path):
+    """
+    Return the atlas:// url for an './images/...' path, if it was packed.
+
+    Images that aren't in a built atlas are returned as is, so the app
+    still runs from a source tree without built atlases.
+    """
+    return _regions.get(path, path)
@@ -0,0 +1,247 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Long-lived helper that runs pvpn-cli commands without starting and
+# importing a fresh interpreter per command. The helper is started as a
+# script (not via the package, which imports kivy); standard library only.
+
+# Standard Libraries
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import traceback
+from time import monotonic, sleep
+
+# Marks the helper's own lines in a command's output stream.
+CONTROL = '\x00'
+# Seconds between checks that the GUI that started the helper still runs.
+PARENT_CHECK_INTERVAL = 5
+
+
+def _send(conn, message):
+    conn.sendall(f'{CONTROL}{json.dumps(message)}\n'.encode())
+
+
+def _run_cli(args):
+    """Run pvpn-cli with args in this (forked) process; doesn't return."""
+    from protonvpn_cli.cli import main
+
+    sys.argv = ['protonvpn'] + args
+    returncode = 0
+    try:
+        main()
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            returncode = e.code
+        elif e.code is not None:
+            print(e.code, file=sys.stderr)
+            returncode = 1
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(returncode)
+
+
+def _handle(server, conn):
+    """Run the command requested on conn and report its result."""
+    with conn.makefile('r') as f:
+        args = json.loads(f.readline())['args']
+    if not all(isinstance(arg, str) for arg in args):
+        raise ValueError('args must be strings')
+    go_r, go_w = os.pipe()
+    started = monotonic()
+    pid = os.fork()
+    if pid == 0:
+        # New session, like a separately started CLI, so the GUI can
+        # cancel the command along with any openvpn it started.
+        os.setsid()
+        server.close()
+        os.close(go_w)
+        # Wait until the GUI has the pid, before any output.
+        os.read(go_r, 1)
+        os.close(go_r)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(conn.fileno(), 1)
+        os.dup2(conn.fileno(), 2)
+        sys.stdout = open(1, 'w', buffering=1, closefd=False)
+        sys.stderr = open(2, 'w', buffering=1, closefd=False)
+        _run_cli(args)
+    os.close(go_r)
+    try:
+        _send(conn, {'pid': pid})
+    finally:
+        os.write(go_w, b'x')
+        os.close(go_w)
+    _, status = os.waitpid(pid, 0)
+    if os.WIFSIGNALED(status):
+        returncode = -os.WTERMSIG(status)
+    else:
+        returncode = os.WEXITSTATUS(status)
+    _send(conn, {
+        'returncode': returncode,
+        'elapsed': monotonic() - started,
+    })
+
+
+def serve(path, parent_pid):
+    """Serve commands on the Unix socket at path until parent_pid exits."""
+    # Import the CLI (and its dependencies) once; commands run in forks.
+    import protonvpn_cli.cli  # noqa
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+    server.settimeout(PARENT_CHECK_INTERVAL)
+    while os.getppid() == parent_pid:
+        try:
+            conn, _ = server.accept()
+        except socket.timeout:
+            continue
+        with conn:
+            try:
+                _handle(server, conn)
+            except (OSError, ValueError, KeyError) as e:
+                print('Exception from CLI helper: ', e, file=sys.stderr)
+
+
+class HelperProcess(object):
+    """
+    A command running on the helper, with the Popen interface that
+    CommandRunner uses: pid (its process group), stdout, poll() and
+    wait(). `elapsed` is the command's run time inside the helper.
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.stdout = self
+        self.returncode = None
+        self.elapsed = None
+        self._lines = sock.makefile('r', encoding='utf-8', errors='replace')
+        header = self._lines.readline()
+        try:
+            self.pid = json.loads(header[1:])['pid']
+        except (ValueError, KeyError):
+            self.close()
+            raise OSError('No response from CLI helper')
+
+    def __iter__(self):
+        for line in self._lines:
+            if line.startswith(CONTROL):
+                result = json.loads(line[1:])
+                self.returncode = result['returncode']
+                self.elapsed = result['elapsed']
+                return
+            yield line
+        # The helper went away before reporting a result.
+        self.returncode = 1
+
+    def close(self):
+        self._lines.close()
+        self.sock.close()
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self):
+        if self.returncode is None and not self._lines.closed:
+            for _ in self:
+                pass
+        if self.returncode is None:
+            self.returncode = 1
+        return self.returncode
+
+
+class CliHelper(object):
+    """
+    Run pvpn-cli commands in a long-lived helper process.
+
+    The helper imports the CLI once, then serves commands over a Unix
+    socket in a private temp directory, forking per command, so commands
+    skip interpreter startup and imports. start() launches it in the
+    background; run() waits up to `start_timeout` seconds for it to come
+    up and restarts it if it died.
+    """
+
+    def __init__(self, start_timeout=10):
+        self.start_timeout = start_timeout
+        self.process = None
+        self.socket_dir = None
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Launch the helper without waiting for it to be ready."""
+        self.socket_dir = tempfile.mkdtemp(prefix='pvpn-gui-')
+        self.path = os.path.join(self.socket_dir, 'helper.sock')
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), self.path],
+            stdin=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def stop(self):
+        """Stop the helper; commands already running are left to finish."""
+        if self.process:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+        if self.socket_dir:
+            shutil.rmtree(self.socket_dir, ignore_errors=True)
+            self.socket_dir = None
+
+    def _connect(self):
+        deadline = monotonic() + self.start_timeout
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+                return sock
+            except OSError:
+                sock.close()
+                # Still importing the CLI, or it failed to start.
+                if not self.running or monotonic() > deadline:
+                    raise
+            sleep(0.05)
+
+    def run(self, args):
+        """Start pvpn-cli with args (a list) and return a HelperProcess."""
+        if not self.running:
+            self.stop()
+            self.start()
+        sock = self._connect()
+        try:
+            sock.sendall(f'{json.dumps({"args": args})}\n'.encode())
+        except OSError:
+            sock.close()
+            raise
+        return HelperProcess(sock)
+
+
+if __name__ == '__main__':
+    serve(sys.argv[1], os.getppid())
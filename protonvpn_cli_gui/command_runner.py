@@ -0,0 +1,177 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+import os
+import queue
+import shlex
+import signal
+import subprocess
+import threading
+from time import monotonic
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import logger as pvpncli_logger
+
+
+class CommandJob(object):
+    """A single command queued on a CommandRunner."""
+
+    def __init__(self, cmd, on_output=None, on_complete=None):
+        self.cmd = cmd
+        self.on_output = on_output
+        self.on_complete = on_complete
+        self.output = []
+        self.returncode = None
+        self.error = None
+        self.cancelled = False
+        self.process = None
+        # Seconds from start to completion.
+        self.elapsed = None
+
+    @property
+    def succeeded(self):
+        return self.returncode == 0 and not self.cancelled
+
+
+class CommandRunner(object):
+    """
+    Run CLI commands (e.g., `protonvpn c ...`) on a worker thread.
+
+    Commands run one at a time, in order. Each output line goes to the job's
+    `on_output(line)`, and `on_complete(job)` runs when the job finishes.
+    Both callbacks go through `dispatch`, which hands them to the UI thread.
+    Cancelled jobs do not report back.
+
+    With a CliHelper, `protonvpn` commands run on the helper, which skips
+    interpreter startup; if the helper is unavailable they're started
+    as usual.
+    """
+
+    def __init__(self, dispatch, helper=None):
+        self.dispatch = dispatch
+        self.helper = helper
+        self.current_job = None
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run,
+            name='CommandRunner',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def run(self, cmd, on_output=None, on_complete=None):
+        """Queue cmd for execution and return its CommandJob."""
+        job = CommandJob(cmd, on_output, on_complete)
+        self._jobs.put(job)
+        return job
+
+    def cancel(self):
+        """Cancel queued jobs and terminate the in-flight one, if any."""
+        while True:
+            try:
+                self._jobs.get_nowait().cancelled = True
+            except queue.Empty:
+                break
+        with self._lock:
+            job = self.current_job
+            if job is None:
+                return
+            job.cancelled = True
+            if job.process and job.process.poll() is None:
+                pvpncli_logger.logger.debug(f"Cancelling command: {job.cmd}")
+                # Terminate the whole process group, including any openvpn
+                # process the CLI already started for this attempt.
+                try:
+                    os.killpg(job.process.pid, signal.SIGTERM)
+                except OSError:
+                    pass
+
+    def _notify(self, job, callback, *args):
+        if callback and not job.cancelled:
+            self.dispatch(callback, *args)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            with self._lock:
+                if job.cancelled:
+                    continue
+                self.current_job = job
+            self._run_job(job)
+
+    def _start_on_helper(self, args):
+        """Return args started on the helper, or None if unavailable."""
+        if not self.helper or args[:1] != ['protonvpn']:
+            return None
+        try:
+            return self.helper.run(args[1:])
+        except OSError as e:
+            pvpncli_logger.logger.debug(f"CLI helper unavailable: {e}")
+            return None
+
+    def _run_job(self, job):
+        # Unbuffered output so progress lines arrive as they are printed.
+        env = dict(os.environ, PYTHONUNBUFFERED='1')
+        args = shlex.split(job.cmd)
+        started = monotonic()
+        process = self._start_on_helper(args)
+        with self._lock:
+            if job.cancelled:
+                self.current_job = None
+                if process:
+                    try:
+                        os.killpg(process.pid, signal.SIGTERM)
+                    except OSError:
+                        pass
+                    process.stdout.close()
+                return
+            job.process = process
+            try:
+                job.process = job.process or subprocess.Popen(
+                    args,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    env=env,
+                    start_new_session=True,
+                    universal_newlines=True,
+                )
+            except OSError as e:
+                print('Exception from CommandRunner: ', e)
+                job.error = e
+        if job.process:
+            for line in job.process.stdout:
+                line = line.rstrip('\n')
+                job.output.append(line)
+                self._notify(job, job.on_output, line)
+            job.process.stdout.close()
+            job.returncode = job.process.wait()
+        job.elapsed = monotonic() - started
+        helper_elapsed = getattr(job.process, 'elapsed', None)
+        if helper_elapsed is not None:
+            pvpncli_logger.logger.debug(
+                f'Command "{job.cmd}" took {job.elapsed * 1000:.0f} ms '
+                f'({helper_elapsed * 1000:.0f} ms on the CLI helper)'
+            )
+        else:
+            pvpncli_logger.logger.debug(
+                f'Command "{job.cmd}" took {job.elapsed * 1000:.0f} ms'
+            )
+        with self._lock:
+            self.current_job = None
+        self._notify(job, job.on_complete, job)
@@ -0,0 +1,86 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+from configparser import ConfigParser
+import os
+import threading
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import constants as pvpncli_constants
+
+
+class ConfigCache(object):
+    """
+    In-process cache of a ConfigParser file.
+
+    The file is parsed once and served from memory. Each read stats the file
+    and re-parses only when its inode, mtime or size changed, so edits made
+    by protonvpn-cli (e.g., connection metadata) are still picked up.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._config = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _current(self):
+        """Return the parsed config, re-parsing if the file changed."""
+        signature = self._file_signature()
+        with self._lock:
+            if self._config is None or signature != self._signature:
+                config = ConfigParser()
+                config.read(self.path)
+                self._config = config
+                self._signature = signature
+            return self._config
+
+    def invalidate(self):
+        """Force a re-parse on the next read (e.g., after writing)."""
+        with self._lock:
+            self._config = None
+
+    def get(self, group, key):
+        """
+        Return a specific value from the config file.
+
+        Raises KeyError when missing, same as pvpncli_utils.get_config_value.
+        """
+        return self._current()[group][key]
+
+    def get_int(self, group, key):
+        """Return a specific value from the config file as an int."""
+        return int(self.get(group, key))
+
+    def section(self, group):
+        """Return a copy of a section as a dict; empty if missing."""
+        config = self._current()
+        if config.has_section(group):
+            return dict(config[group])
+        return {}
+
+
+# Shared cache of pvpn-cli.cfg for all screens.
+pvpn_config = ConfigCache(pvpncli_constants.CONFIG_FILE)
@@ -0,0 +1,262 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+import ctypes
+import ctypes.util
+import os
+import select
+import threading
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import logger as pvpncli_logger
+
+# inotify(7) events for a file written in, or moved into, a directory.
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_TO = 0x80
+
+
+def watch_directory(path):
+    """
+    Return a non-blocking inotify fd, readable once a file in path is written.
+
+    Returns None where inotify isn't available (e.g., path doesn't exist or
+    the watch limit is reached).
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = IN_CLOSE_WRITE | IN_MOVED_TO
+    if libc.inotify_add_watch(fd, os.fsencode(path), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def find_process(process_name):
+    """
+    Return the pid of the first process whose name matches exactly, else None.
+
+    Equivalent to `pgrep --exact <name>`, but reads /proc directly so no
+    child process is spawned.
+    """
+    try:
+        pids = os.listdir('/proc')
+    except OSError:
+        return None
+    for pid in pids:
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid}/comm', 'r') as f:
+                comm = f.read().rstrip('\n')
+        except OSError:
+            # Process exited while scanning.
+            continue
+        if comm == process_name:
+            return int(pid)
+    return None
+
+
+def process_alive(pid, process_name):
+    """Determine if pid still exists and still belongs to process_name."""
+    try:
+        with open(f'/proc/{pid}/comm', 'r') as f:
+            return f.read().rstrip('\n') == process_name
+    except OSError:
+        return False
+
+
+def process_start_time(pid):
+    """Return when pid started, in seconds since the epoch, or None."""
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            # Fields after the command name, which may contain spaces.
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/stat', 'r') as f:
+            boot_time = next(
+                int(line.split()[1]) for line in f
+                if line.startswith('btime ')
+            )
+        return boot_time + int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, StopIteration):
+        return None
+
+
+class OpenVpnWatcher(object):
+    """
+    Watch the OpenVPN process and report connection state changes.
+
+    The process is located once via a /proc scan. While it runs, the watcher
+    thread blocks on a pidfd until the process exits, so no polling takes
+    place while connected. Kernels/Pythons without pidfd support fall back
+    to a cheap /proc check every `scan_interval` seconds.
+
+    While disconnected, /proc is rescanned when rescan() is called (e.g.,
+    after a connect command completes) and, if `watch_dir` is given, when
+    a file in it is written: pvpn-cli writes its connection metadata to
+    its config directory once connected, which covers connections started
+    outside the GUI. Without `watch_dir`, or where inotify isn't available,
+    /proc is rescanned every `scan_interval` seconds instead.
+
+    `on_change(connected)` is called from the watcher thread whenever the
+    connection state changes; callers must hand it off to the UI thread.
+    `started_at` is when the current process started (epoch seconds).
+    """
+
+    def __init__(self, on_change, process_name='openvpn', scan_interval=1,
+                 watch_dir=None):
+        self.on_change = on_change
+        self.process_name = process_name
+        self.scan_interval = scan_interval
+        self.watch_dir = watch_dir
+        self.pid = None
+        self.started_at = None
+        self._stop_event = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+        self._inotify_fd = None
+        self._thread = None
+
+    @property
+    def connected(self):
+        """True while an OpenVPN process is running."""
+        return self.pid is not None
+
+    def start(self):
+        """Perform initial scan and start the watcher thread."""
+        self.pid = find_process(self.process_name)
+        if self.pid is not None:
+            self.started_at = process_start_time(self.pid)
+        if self.watch_dir:
+            self._inotify_fd = watch_directory(self.watch_dir)
+            if self._inotify_fd is None:
+                pvpncli_logger.logger.debug(
+                    f"OpenVPN watcher: can't watch {self.watch_dir}, "
+                    f"rescanning every {self.scan_interval}s"
+                )
+        self._thread = threading.Thread(
+            target=self._run,
+            name='OpenVpnWatcher',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watcher thread."""
+        self._stop_event.set()
+        self.rescan()
+        if self._thread:
+            self._thread.join(timeout=1)
+            if self._thread.is_alive():
+                return
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+    def rescan(self):
+        """Wake the watcher thread to re-check the process immediately."""
+        try:
+            os.write(self._wake_w, b'x')
+        except OSError:
+            pass
+
+    def _drain_wakeups(self):
+        try:
+            os.read(self._wake_r, 512)
+        except OSError:
+            pass
+
+    def _drain_events(self, fd):
+        try:
+            while os.read(fd, 4096):
+                pass
+        except OSError:
+            # BlockingIOError once every queued event is read.
+            pass
+
+    def _wait(self, fds, timeout):
+        """Block until any fd is readable or timeout (seconds) expires."""
+        poller = select.poll()
+        for fd in fds:
+            poller.register(fd, select.POLLIN)
+        ready = poller.poll(None if timeout is None else timeout * 1000)
+        ready_fds = [fd for fd, _ in ready]
+        if self._wake_r in ready_fds:
+            self._drain_wakeups()
+        return ready_fds
+
+    def _open_pidfd(self, pid):
+        """Return a pidfd for pid, or None if unsupported/unavailable."""
+        if not hasattr(os, 'pidfd_open'):
+            return None
+        try:
+            return os.pidfd_open(pid)
+        except OSError:
+            return None
+
+    def _wait_for_start(self):
+        """Block until OpenVPN may have started, or the watcher is woken."""
+        if self._inotify_fd is None:
+            self._wait([self._wake_r], self.scan_interval)
+            return
+        ready = self._wait([self._wake_r, self._inotify_fd], None)
+        if self._inotify_fd in ready:
+            self._drain_events(self._inotify_fd)
+
+    def _wait_for_exit(self, pid):
+        """Block until pid exits, or the watcher is woken/stopped."""
+        pidfd = self._open_pidfd(pid)
+        if pidfd is not None:
+            try:
+                ready = self._wait([pidfd, self._wake_r], None)
+            finally:
+                os.close(pidfd)
+            if pidfd in ready:
+                return True
+        else:
+            self._wait([self._wake_r], self.scan_interval)
+        return not process_alive(pid, self.process_name)
+
+    def _set_pid(self, pid):
+        # A changed pid (e.g., fast reconnect) is reported as well, so the
+        # GUI can refresh the connection details.
+        if pid != self.pid:
+            self.started_at = None if pid is None else process_start_time(pid)
+            self.pid = pid
+            pvpncli_logger.logger.debug(
+                f"OpenVPN watcher: connected={self.connected} (pid {pid})"
+            )
+            try:
+                self.on_change(self.connected)
+            except Exception as e:
+                # Keep watching; a failing callback mustn't stop the thread.
+                print('Exception from OpenVpnWatcher: ', e)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            if self.pid is None:
+                self._set_pid(find_process(self.process_name))
+                if self.pid is None:
+                    self._wait_for_start()
+                continue
+            if self._wait_for_exit(self.pid):
+                # A reconnect may already have started a new process.
+                self._set_pid(find_process(self.process_name))
@@ -0,0 +1,62 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import country_codes as pvpncli_country_codes
+
+# Local
+from .assets import image_source
+
+# Country registry, built once at import and shared by every screen.
+
+# Country names by code, e.g., 'CH': 'Switzerland'.
+NAMES = dict(pvpncli_country_codes.country_codes)
+# Country codes by name, e.g., 'Switzerland': 'CH'.
+CODES = {name: code for code, name in NAMES.items()}
+
+NO_FLAG = image_source('./images/widget-background-transparent.png')
+# Flag image paths by country code. Small flags come from the flags atlas
+# when it's built.
+SMALL_FLAGS = {
+    code: image_source(f'./images/flags/small/{code.lower()}_flag.png')
+    for code in NAMES
+}
+LARGE_FLAGS = {
+    code: f'./images/flags/large/{code.lower()}-large.jpg' for code in NAMES
+}
+
+
+def country_name(code):
+    """Return the country name for code, or code itself if unknown."""
+    return NAMES.get(code, code)
+
+
+def country_code(name):
+    """Return the country code for a country name, or None if unknown."""
+    return CODES.get(name)
+
+
+def small_flag(code):
+    """Return the small flag icon for code, or a blank image if unknown."""
+    return SMALL_FLAGS.get(code, NO_FLAG)
+
+
+def large_flag(code):
+    """Return the large flag image for code."""
+    return LARGE_FLAGS.get(code) or (
+        f'./images/flags/large/{code.lower()}-large.jpg'
+    )
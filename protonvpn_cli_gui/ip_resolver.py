@@ -0,0 +1,130 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+import threading
+from time import sleep, time
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import logger as pvpncli_logger
+
+# Local
+from .api_client import api_session, api_url
+from .startup_trace import tracer
+
+LOCATION_ENDPOINT = '/vpn/location'
+
+
+class ExitIpResolver(object):
+    """
+    Look up the public (exit) IP address off the UI thread.
+
+    Results are cached per `key` (the connected server, so reconnecting
+    to it is answered from the cache; None when disconnected) for `ttl`
+    seconds. Failed lookups
+    are retried `retries` times with exponential backoff starting at
+    `backoff` seconds, each request bounded by `timeout`; if all fail, the
+    callback gets None. Lookups for a key already in flight are shared.
+    """
+
+    def __init__(self, dispatch, ttl=300, timeout=5, retries=3, backoff=1,
+                 api_domain=None):
+        self.dispatch = dispatch
+        self.ttl = ttl
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.api_domain = api_domain
+        self.session = api_session()
+        # key -> (ip, resolved at)
+        self._cache = {}
+        # key -> callbacks waiting on the lookup in flight
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def cached(self, key):
+        """Return the cached IP for key if still fresh, else None."""
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry and time() - entry[1] < self.ttl:
+            return entry[0]
+        return None
+
+    def invalidate(self, key=None):
+        """
+        Drop the cached IP for key. A lookup in flight for key is dropped
+        too: its result may predate the change, so it's neither cached
+        nor delivered.
+        """
+        with self._lock:
+            self._cache.pop(key, None)
+            self._pending.pop(key, None)
+
+    def resolve(self, key, on_result):
+        """
+        Return the cached IP for key, or start a lookup and return None.
+
+        When a lookup is started, on_result(ip) is dispatched once it
+        completes; ip is None if every attempt failed.
+        """
+        ip = self.cached(key)
+        if ip:
+            return ip
+        with self._lock:
+            if key in self._pending:
+                self._pending[key].append(on_result)
+                return None
+            callbacks = self._pending[key] = [on_result]
+        threading.Thread(
+            target=self._run,
+            args=(key, callbacks),
+            name='ExitIpResolver',
+            daemon=True,
+        ).start()
+        return None
+
+    def fetch(self):
+        """Return the current public IP from the API."""
+        response = self.session.get(
+            api_url(LOCATION_ENDPOINT, self.api_domain),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()['IP']
+
+    def _run(self, key, callbacks):
+        ip = None
+        with tracer.phase('get_ip_info'):
+            for attempt in range(self.retries + 1):
+                try:
+                    ip = self.fetch()
+                    break
+                except Exception as e:
+                    pvpncli_logger.logger.debug(
+                        f"Exit IP lookup failed (attempt {attempt + 1}): {e}"
+                    )
+                if attempt < self.retries:
+                    sleep(self.backoff * 2 ** attempt)
+        with self._lock:
+            if self._pending.get(key) is not callbacks:
+                # Invalidated while in flight.
+                return
+            del self._pending[key]
+            if ip:
+                self._cache[key] = (ip, time())
+        for callback in callbacks:
+            self.dispatch(callback, ip)
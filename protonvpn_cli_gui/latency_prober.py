@@ -0,0 +1,133 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+from concurrent.futures import ThreadPoolExecutor
+import socket
+import threading
+from time import monotonic
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import logger as pvpncli_logger
+
+# OpenVPN over TCP; servers listen on it for either protocol.
+PROBE_PORT = 443
+
+
+def tcp_connect_time(host, port, timeout):
+    """Return seconds taken to open a TCP connection, or None on failure."""
+    started = monotonic()
+    try:
+        sock = socket.create_connection((host, port), timeout=timeout)
+    except OSError:
+        return None
+    elapsed = monotonic() - started
+    sock.close()
+    return elapsed
+
+
+class LatencyProber(object):
+    """
+    Pick the fastest server by measured latency rather than Score alone.
+
+    Of the servers given, the `candidates` with the best API Score are
+    probed: a TCP connect to each entry IP, at most `max_workers` at a
+    time, each bounded by `timeout`. Results are cached per IP for `ttl`
+    seconds. Servers are then ranked by RTT scaled up by load,
+    rtt * (1 + load_weight * load / 100); unreachable ones are left out.
+
+    Probes should run while disconnected, or they measure the tunnel.
+    """
+
+    def __init__(self, dispatch, port=PROBE_PORT, timeout=1, max_workers=16,
+                 ttl=300, candidates=16, load_weight=1.0):
+        self.dispatch = dispatch
+        self.port = port
+        self.timeout = timeout
+        self.ttl = ttl
+        self.candidates = candidates
+        self.load_weight = load_weight
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # ip -> (rtt, measured at)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def probe(self, ip):
+        """Return the TCP connect time to ip, or None."""
+        return tcp_connect_time(ip, self.port, self.timeout)
+
+    def measure(self, ips):
+        """Return {ip: rtt or None}, probing IPs not cached concurrently."""
+        now = monotonic()
+        results = {}
+        futures = {}
+        with self._lock:
+            for ip in set(ips):
+                entry = self._cache.get(ip)
+                if entry and now - entry[1] < self.ttl:
+                    results[ip] = entry[0]
+                elif ip not in futures:
+                    futures[ip] = self._executor.submit(self.probe, ip)
+        for ip, future in futures.items():
+            results[ip] = future.result()
+        # Failures are only cached if something answered; otherwise the
+        # network itself may have been down.
+        reachable = any(rtt is not None for rtt in results.values())
+        measured_at = monotonic()
+        with self._lock:
+            for ip in futures:
+                if results[ip] is not None or reachable:
+                    self._cache[ip] = (results[ip], measured_at)
+        return results
+
+    def rank(self, servers):
+        """Return the names of reachable servers, best first."""
+        shortlist = sorted(
+            (server for server in servers if server['EntryIP']),
+            key=lambda server: server['Score'],
+        )[:self.candidates]
+        rtts = self.measure(server['EntryIP'] for server in shortlist)
+        ranked = []
+        for server in shortlist:
+            rtt = rtts.get(server['EntryIP'])
+            if rtt is None:
+                continue
+            cost = rtt * (1 + self.load_weight * server['Load'] / 100)
+            ranked.append((cost, server['Name']))
+        ranked.sort()
+        pvpncli_logger.logger.debug(
+            f"Probed {len(shortlist)} servers, {len(ranked)} reachable"
+        )
+        return [name for _, name in ranked]
+
+    def fastest(self, servers, on_result):
+        """
+        Rank servers in the background, then dispatch on_result(name).
+
+        name is None if no server could be reached.
+        """
+        servers = list(servers)
+        threading.Thread(
+            target=self._run,
+            args=(servers, on_result),
+            name='LatencyProber',
+            daemon=True,
+        ).start()
+
+    def _run(self, servers, on_result):
+        ranked = self.rank(servers)
+        self.dispatch(on_result, ranked[0] if ranked else None)
@@ -0,0 +1,264 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+from collections import namedtuple
+import os
+import socket
+import threading
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import constants as pvpncli_constants
+from protonvpn_cli import logger as pvpncli_logger
+
+MANAGEMENT_SOCKET = os.path.join(
+    pvpncli_constants.CONFIG_DIR,
+    'management.sock',
+)
+
+# One state change, as reported by `state` (fields we use, in order).
+OpenVpnState = namedtuple('OpenVpnState', [
+    'timestamp',
+    'name',
+    'description',
+    'local_ip',
+    'remote_ip',
+    'remote_port',
+])
+
+
+def management_directive(path=MANAGEMENT_SOCKET):
+    """Return the config line opening a management socket at path."""
+    return f'management "{path}" unix'
+
+
+def management_template():
+    """
+    Return pvpn-cli's OpenVPN template file, or None if it has none.
+
+    Only protonvpn-cli releases before 2.2, which render each connection's
+    config from constants.TEMPLATE_FILE, can be given a management socket.
+    Later releases build the config in code, so the GUI follows connections
+    with the process watcher alone.
+    """
+    return getattr(pvpncli_constants, 'TEMPLATE_FILE', None)
+
+
+def _read_template(template_file):
+    with open(template_file, 'r') as f:
+        return f.read().splitlines()
+
+
+def _write_template(template_file, lines):
+    with open(template_file, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def add_management_directive(template_file=None, path=MANAGEMENT_SOCKET):
+    """
+    Have OpenVPN open a management socket at path.
+
+    pvpn-cli builds each connection's config from its OpenVPN template,
+    so the directive is added there; undo with remove_management_directive()
+    on exit. A template with a management directive of its own is left
+    alone. Returns True if the template has the directive.
+    """
+    if template_file is None:
+        template_file = management_template()
+    if template_file is None:
+        pvpncli_logger.logger.debug(
+            "OpenVPN management unavailable: protonvpn-cli "
+            f"{pvpncli_constants.VERSION} has no OpenVPN template"
+        )
+        return False
+    directive = management_directive(path)
+    try:
+        lines = _read_template(template_file)
+        if directive in lines:
+            return True
+        if any(line.startswith('management ') for line in lines):
+            pvpncli_logger.logger.debug(
+                "OpenVPN management unavailable: the template already "
+                "opens a management interface"
+            )
+            return False
+        _write_template(template_file, lines + [directive])
+    except OSError as e:
+        print('Exception from add_management_directive(): ', e)
+        return False
+    pvpncli_logger.logger.debug("Management directive added to template")
+    return True
+
+
+def remove_management_directive(template_file=None, path=MANAGEMENT_SOCKET):
+    """Remove the directive add_management_directive() added, if any."""
+    if template_file is None:
+        template_file = management_template()
+    if template_file is None:
+        return
+    directive = management_directive(path)
+    try:
+        lines = _read_template(template_file)
+        if directive not in lines:
+            return
+        _write_template(
+            template_file,
+            [line for line in lines if line != directive],
+        )
+    except OSError as e:
+        print('Exception from remove_management_directive(): ', e)
+        return
+    pvpncli_logger.logger.debug("Management directive removed from template")
+
+
+def parse_state(line):
+    """Return an OpenVpnState from a line like '1590000000,CONNECTED,...'."""
+    fields = (line.split(',') + [''] * 6)[:6]
+    try:
+        timestamp = int(fields[0])
+    except ValueError:
+        return None
+    return OpenVpnState(timestamp, *fields[1:])
+
+
+class ManagementClient(object):
+    """
+    Follow OpenVPN's state and byte counts over its management socket.
+
+    Once connected, the client subscribes to real-time `state` and
+    `bytecount` notifications: `on_state(state)` is called with an
+    OpenVpnState on every state change (first with the current state),
+    and with None when the socket closes, i.e., OpenVPN exited.
+    `on_bytecount(rx, tx)` is called every `bytecount_interval` seconds.
+    Both are called from the client thread; callers must hand them off
+    to the UI thread.
+
+    While OpenVPN isn't running the thread sleeps until wake() is called
+    (e.g., when the process watcher sees OpenVPN start); the socket is
+    then retried `connect_attempts` times, `retry_delay` seconds apart,
+    since OpenVPN opens it shortly after starting.
+    """
+
+    def __init__(self, on_state, on_bytecount, path=MANAGEMENT_SOCKET,
+                 bytecount_interval=1, connect_attempts=20, retry_delay=0.25):
+        self.on_state = on_state
+        self.on_bytecount = on_bytecount
+        self.path = path
+        self.bytecount_interval = bytecount_interval
+        self.connect_attempts = connect_attempts
+        self.retry_delay = retry_delay
+        self.sock = None
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def connected(self):
+        """True while attached to OpenVPN's management socket."""
+        return self.sock is not None
+
+    def start(self):
+        """Start the client thread; tries the socket right away."""
+        self._wake_event.set()
+        self._thread = threading.Thread(
+            target=self._run,
+            name='ManagementClient',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Close the socket and stop the client thread."""
+        self._stop_event.set()
+        self._wake_event.set()
+        sock = self.sock
+        if sock:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=1)
+
+    def wake(self):
+        """Try the socket now, e.g., after OpenVPN was started."""
+        self._wake_event.set()
+
+    def _connect(self):
+        """Return a socket attached to OpenVPN, or None."""
+        for attempt in range(self.connect_attempts):
+            if self._stop_event.is_set():
+                return None
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+                return sock
+            except OSError:
+                sock.close()
+            self._stop_event.wait(self.retry_delay)
+        return None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wake_event.wait()
+            self._wake_event.clear()
+            sock = self._connect()
+            if sock is None:
+                continue
+            self.sock = sock
+            pvpncli_logger.logger.debug("Attached to OpenVPN management")
+            try:
+                self._follow(sock)
+            except OSError as e:
+                pvpncli_logger.logger.debug(f"Management socket error: {e}")
+            finally:
+                self.sock = None
+                sock.close()
+            pvpncli_logger.logger.debug("Detached from OpenVPN management")
+            self.on_state(None)
+
+    def _follow(self, sock):
+        """Subscribe to notifications and handle them until EOF."""
+        sock.sendall(
+            f'state on all\nbytecount {self.bytecount_interval}\n'.encode()
+        )
+        # `state on all` first lists past states, ending with END.
+        history = []
+        with sock.makefile('r', encoding='utf-8', errors='replace') as lines:
+            for line in lines:
+                line = line.rstrip('\r\n')
+                if line.startswith('>STATE:'):
+                    state = parse_state(line[7:])
+                    if state:
+                        self.on_state(state)
+                elif line.startswith('>BYTECOUNT:'):
+                    try:
+                        rx, tx = (int(n) for n in line[11:].split(','))
+                    except ValueError:
+                        continue
+                    self.on_bytecount(rx, tx)
+                elif line == 'END':
+                    if history:
+                        self.on_state(history[-1])
+                    history = []
+                elif line.startswith(('>', 'SUCCESS:', 'ERROR:')):
+                    if not line.startswith('>INFO:'):
+                        pvpncli_logger.logger.debug(f"Management: {line}")
+                else:
+                    state = parse_state(line)
+                    if state:
+                        history.append(state)
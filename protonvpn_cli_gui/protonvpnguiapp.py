@@ -15,7 +15,11 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import kivy
+# Must come first: strips the startup trace flag before kivy parses argv.
+from .startup_trace import FIRST_FRAME, INTERACTIVE, tracer
+
+tracer.begin('import kivy')
+import kivy  # noqa
 # Minimum supported version - Ignore at your own risk.
 kivy.require('1.10.1') # noqa
 
@@ -34,12 +38,13 @@ Config.set('graphics', 'window_state', 'visible')
 Config.set('kivy', 'desktop', '1')
 Config.set('kivy', 'exit_on_escape', '0')
 Config.set('kivy', 'window_icon', '/usr/local/lib/python3.6/dist-packages/protonvpn_cli_gui/protonvpn.ico')
+tracer.end('import kivy')
 
+tracer.begin('imports')
 # Standard Libraries
 from functools import partial  # noqa
+from importlib import import_module  # noqa
 import os  # noqa
-import requests  # noqa
-import subprocess  # noqa
 from time import time  # noqa
 
 # Kivy Libraries
@@ -56,7 +61,6 @@ from kivy.properties import (  # noqa # pylint: disable=no-name-in-module
 )
 from kivy.resources import resource_add_path  # noqa
 from kivy.uix.boxlayout import BoxLayout  # noqa
-from kivy.uix.image import Image  # noqa
 from kivy.uix.label import Label  # noqa
 from kivy.uix.screenmanager import (  # noqa
     FadeTransition,
@@ -66,7 +70,6 @@ from kivy.uix.screenmanager import (  # noqa
 
 # protonvpn-cli-ng Functions
 from protonvpn_cli import constants as pvpncli_constants  # noqa
-from protonvpn_cli import country_codes as pvpncli_country_codes  # noqa
 from protonvpn_cli import logger as pvpncli_logger  # noqa
 from protonvpn_cli import utils as pvpncli_utils  # noqa
 
@@ -75,18 +78,35 @@ from .widgets import (  # noqa # pylint: disable=import-error
     ExitPopup,
     PvpnPopup,
     PvpnPopupLabel,
-    PvpnTreeView,
-    PvpnServerTreeCountryNode,
-    PvpnServerTreeServerNode,
     SecureCoreNotificationPopup,
 )
-from .about_screen import AboutScreen  # noqa
-from .app_settings_screen import AppSettingsScreen  # noqa
-from .connection_profiles_screen import ConnectionProfilesScreen  # noqa
-from .vpn_settings_screen import VpnSettingsScreen  # noqa
+from .assets import image_source  # noqa
+from .cli_helper import CliHelper  # noqa
+from .command_runner import CommandRunner  # noqa
+from .config_cache import pvpn_config  # noqa
+from .connection_watcher import OpenVpnWatcher  # noqa
+from . import countries  # noqa
+from .ip_resolver import ExitIpResolver  # noqa
+from .latency_prober import LatencyProber  # noqa
 from .main_screen import MainScreen  # noqa
-from .report_bug_screen import ReportBugScreen  # noqa
+from .openvpn_management import (  # noqa
+    ManagementClient,
+    add_management_directive,
+    remove_management_directive,
+)
+from .refresh_coordinator import RefreshCoordinator  # noqa
+from .server_catalog import SECURE_CORE  # noqa
+from .server_data import (  # noqa
+    ServerDataWorker,
+    cached_server_catalog,
+    format_data_age,
+    server_list_client,
+)
+from .status_sampler import StatusSampler  # noqa
+from .texture_cache import TextureCache  # noqa
+from .update_checker import UpdateChecker  # noqa
 from .welcome_screen import WelcomeScreen  # noqa
+tracer.end('imports')
 
 # Set version of GUI app
 VERSION = '0.1.10'
@@ -95,20 +115,52 @@ VERSION = '0.1.10'
 DIR_PATH = os.path.dirname(os.path.realpath(__file__))
 resource_add_path(DIR_PATH)
 
-# Load kv files
+# Load kv files needed for the welcome and main screens. Other screens load
+# their kv files when first shown, see LAZY_SCREENS.
 kv_files = [
-    'about_screen.kv',
-    'app_settings_screen.kv',
-    'connection_profiles_screen.kv',
-    'vpn_settings_screen.kv',
     'main_screen.kv',
-    'report_bug_screen.kv',
     'welcome_screen.kv',
     'widgets.kv',
     'devclasses.kv',
 ]
-for kv in kv_files:
-    Builder.load_file(os.path.join(DIR_PATH, kv))
+with tracer.phase('kv parsing'):
+    for kv in kv_files:
+        Builder.load_file(os.path.join(DIR_PATH, kv))
+
+# Screens built the first time they're navigated to, by screen name:
+# (module, class name, kv file, id under ProtonVpnGui.ids).
+LAZY_SCREENS = {
+    '_about_screen_': (
+        '.about_screen',
+        'AboutScreen',
+        'about_screen.kv',
+        'about_screen',
+    ),
+    '_app_settings_screen_': (
+        '.app_settings_screen',
+        'AppSettingsScreen',
+        'app_settings_screen.kv',
+        'app_settings_screen',
+    ),
+    '_connection_profiles_screen_': (
+        '.connection_profiles_screen',
+        'ConnectionProfilesScreen',
+        'connection_profiles_screen.kv',
+        'connect_profiles_screen',
+    ),
+    '_report_bug_screen_': (
+        '.report_bug_screen',
+        'ReportBugScreen',
+        'report_bug_screen.kv',
+        'report_bug_screen',
+    ),
+    '_vpn_settings_screen_': (
+        '.vpn_settings_screen',
+        'VpnSettingsScreen',
+        'vpn_settings_screen.kv',
+        'vpn_settings_screen',
+    ),
+}
 
 
 class ProtonVpnGui(ScreenManager, BoxLayout):
@@ -133,6 +185,59 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
         welcome_screen.ids.pvpn_cli_version.text = protonvpn_cli_version
         welcome_screen.ids.pvpn_gui_verion.text = f'ProtonVPN-CLI-GUI v{VERSION}'  # noqa
 
+        # Run CLI commands off the UI thread, on a helper process that has
+        # the CLI imported already.
+        self.cli_helper = CliHelper()
+        self.cli_helper.start()
+        self.cmd_runner = CommandRunner(
+            self.run_on_ui_thread,
+            helper=self.cli_helper,
+        )
+        # Pull and index server data off the UI thread.
+        self.server_data_worker = ServerDataWorker(self.run_on_ui_thread)
+        server_list_client.dispatch = self.run_on_ui_thread
+        self.connecting_notification_popup = None
+        # Fastest server picks by measured latency; bumped to drop picks
+        # for connection attempts that were replaced in the meantime.
+        self.latency_prober = LatencyProber(self.run_on_ui_thread)
+        self.connect_attempt = 0
+        # Exit IP lookups, off the UI thread and cached per server.
+        self.ip_resolver = ExitIpResolver(self.run_on_ui_thread)
+        # Connection whose exit IP is shown; False until one is shown.
+        self.exit_ip_key = False
+        # Follows OpenVPN over its management socket, if enabled.
+        self.management_client = None
+        # Last state OpenVPN reported over its management socket.
+        self.openvpn_state = None
+        # Connection window images, decoded off the UI thread.
+        self.connection_images = TextureCache(max_size=8)
+        self.connection_image = None
+
+    def on_current(self, instance, value):
+        """Build a lazily loaded screen before switching to it."""
+        self.load_screen(value)
+        super().on_current(instance, value)
+
+    def load_screen(self, name):
+        """Load the kv rules and build screen name, if not done yet."""
+        if name not in LAZY_SCREENS or self.has_screen(name):
+            return
+        module, class_name, kv_file, screen_id = LAZY_SCREENS[name]
+        started = time()
+        screen_class = getattr(import_module(module, __package__), class_name)
+        Builder.load_file(os.path.join(DIR_PATH, kv_file))
+        screen = screen_class()
+        self.add_widget(screen)
+        self.ids[screen_id] = screen
+        pvpncli_logger.logger.debug(
+            f"Built {class_name} in {time() - started:.3f}s"
+        )
+
+    @staticmethod
+    def run_on_ui_thread(callback, *args):
+        """Schedule callback(*args) on the Kivy main thread."""
+        Clock.schedule_once(lambda dt: callback(*args))
+
     def open_exit_popup(self):
         """Open Exit Popup to confirm exiting the application."""
         self.exit_popup = ExitPopup(
@@ -147,22 +252,27 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
         self.initialize_application()
         self.transition = FadeTransition()
         self.current = '_main_screen_'
+        Clock.schedule_once(lambda dt: tracer.mark(INTERACTIVE))
 
     def initialize_vpn_settings(self, dt):
         """Start a new profile for VPN connection."""
         self.transition = NoTransition()
         self.current = '_vpn_settings_screen_'
+        # Nothing else happens at startup until a profile is set up.
+        Clock.schedule_once(lambda dt: tracer.mark(INTERACTIVE))
+        Clock.schedule_once(lambda dt: tracer.finish())
 
     def initialize_application(self, *dt):
         """Initialize app's main screen and subsequent functionality."""
+        tracer.begin('initialize_application')
         # Indicator that app was just initialized.
         self.app_newly_initialized = True
         # Get default protocol (TCP or UDP) and User's account tier-level.
-        self.default_protocol = pvpncli_utils.get_config_value(
+        self.default_protocol = pvpn_config.get(
             "USER",
             "default_protocol",
         )
-        self.tier = int(pvpncli_utils.get_config_value(
+        self.tier = int(pvpn_config.get(
             "USER",
             "tier",
         ))
@@ -173,20 +283,52 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
             self.secure_core.disabled = True
         # State of Secure Core Notification Popup
         self.sc_notification_open = False
-        # Schedule check for connection change and trigger update if found.
-        self.cnxn_check = Clock.schedule_interval(self.check_current_cnxn, 1)
-        # Schedule refresh of data trans/recvd.
-        self.data_trans = Clock.schedule_interval(self.get_data_up_down, 1)
-        # Schedule refresh of connection time
-        self.cnxn_time = Clock.schedule_interval(self.get_connection_time, 1)
+        # Follow OpenVPN's state and byte counts over its management socket,
+        # for connections started after the directive is in the template.
+        # Opt-in, as pvpn-cli's template is edited (and restored on exit).
+        # Started first: the watcher wakes it as soon as OpenVPN is found.
+        if self.management_client is None:
+            if not self.openvpn_management_enabled():
+                # Left over if the app didn't exit cleanly.
+                remove_management_directive()
+            elif add_management_directive():
+                self.management_client = ManagementClient(
+                    partial(self.run_on_ui_thread, self.show_openvpn_state),
+                    partial(self.run_on_ui_thread, self.set_openvpn_bytecount),  # noqa
+                )
+                self.management_client.start()
+        # Watch the OpenVPN process; state changes trigger a connection check.
+        # /proc is only rescanned when pvpn-cli writes to its config dir.
+        if not getattr(self, 'cnxn_watcher', None):
+            self.cnxn_watcher = OpenVpnWatcher(
+                self.on_cnxn_state_change,
+                watch_dir=pvpncli_constants.CONFIG_DIR,
+            )
+            self.cnxn_watcher.start()
         # Current connection status
         self.vpn_connected = self.is_connected()
         # Used for detecting connection changes
         self.last_known_connection = None
-        # Schedule update of server tree every 5 min
-        self.update_server_tree = (
-            Clock.schedule_interval(self.update_server_tree_info, 300)
-        )
+        # Sample connection status (time, data trans/recvd, etc.) once per
+        # second in a single pass; labels only redraw when values change.
+        # Only ticks while connected; connection changes are reported by
+        # the watcher, and the server data age is updated separately.
+        self.status_sampler = StatusSampler(self.is_connected)
+        if not getattr(self, 'status_check', None):
+            self.status_check = Clock.create_trigger(
+                self.check_current_cnxn,
+                1,
+                interval=True,
+            )
+            self.status_check()
+            Clock.schedule_interval(self.update_server_data_age, 30)
+        # All server list refreshes go through one coordinator, which also
+        # refreshes every 5 min.
+        if not getattr(self, 'server_refresh', None):
+            self.server_refresh = RefreshCoordinator(
+                self.update_server_tree_info,
+                interval=300,
+            )
         # Set initial connection window button image based on connection status
         self.cnxn_wndw_btn = self.ids.main_screen.ids.connection_window_button
         if self.vpn_connected:
@@ -197,55 +339,73 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
             self.cnxn_wndw_btn.normal_img = './images/quick_connect.png'
             self.cnxn_wndw_btn.hover_img = './images/quick_connect_hover.png'
             self.cnxn_wndw_btn.source = './images/quick_connect.png'
+        # Show the last saved server data until the latest data is pulled.
+        self.server_catalog = cached_server_catalog()
+        # Set when the latest pull failed and saved data is being shown.
+        self.server_data_offline = False
+        # Start decoding connection window images.
+        self.preload_connection_images()
         # Update current connection info in connection window.
         self.update_current_connection()
         # Initialize server tree.
         self.build_server_tree()
+        tracer.end('initialize_application')
 
     def is_connected(self):
         """
         Local version of CLI function, minus logging, to be used for
-        frequent, scheduled connection checks. ProtonVPN-CLI's function
-        is still used to connect, disconnect, etc.
+        frequent connection checks. ProtonVPN-CLI's function is still used to
+        connect, disconnect, etc.
 
-        Purpose: Check if a VPN connection already exists.
+        Purpose: Check if a VPN connection already exists. State is kept
+        current by the OpenVPN process watcher, so no process is spawned.
         """
-        ovpn_processes = subprocess.run(
-            ["pgrep", "--exact", "openvpn"],
-            stdout=subprocess.PIPE
-        )
-        ovpn_processes = ovpn_processes.stdout.decode("utf-8").split()
-        return True if ovpn_processes != [] else False
+        return self.cnxn_watcher.connected
+
+    def openvpn_management_enabled(self):
+        """True if USER gui_openvpn_management is set to 1."""
+        try:
+            return pvpn_config.get_int("USER", "gui_openvpn_management") == 1
+        except (KeyError, ValueError):
+            return False
+
+    def on_cnxn_state_change(self, connected):
+        """Called from the watcher thread; hand off to the UI thread."""
+        if connected and self.management_client:
+            self.management_client.wake()
+        Clock.schedule_once(self.check_current_cnxn)
+
+    def show_openvpn_state(self, state):
+        """Show OpenVPN state changes as soon as they're reported."""
+        if state is None:
+            # OpenVPN exited; the process watcher reports the disconnect.
+            self.openvpn_state = None
+            return
+        self.openvpn_state = state.name
+        if state.name == 'CONNECTED':
+            # (Re)connected, so show the exit IP again.
+            self.exit_ip_key = False
+            self.update_current_connection()
+        elif self.vpn_connected:
+            # Transitions, e.g., RECONNECTING or EXITING.
+            description = state.name.lower().replace('_', ' ')
+            self.ids.main_screen.ids.protocol.text = (
+                f'OpenVPN ({description}...)'
+            )
+
+    def set_openvpn_bytecount(self, rx, tx):
+        """Use the byte counts OpenVPN reports for the throughput meter."""
+        self.status_sampler.set_counters(rx, tx)
 
     def update_current_connection(self, *dt):
         """Update the current connection info."""
         # Check for active connection
         self.vpn_connected = self.is_connected()
         if self.vpn_connected:
-            # Cancel scheduled events, if they exist.
-            if self.data_trans:
-                self.data_trans.cancel()
-            if self.cnxn_time:
-                self.cnxn_time.cancel()
-
-            servers = pvpncli_utils.get_servers()
-
-            ip = None
-            while not ip:
-                try:
-                    ip = pvpncli_utils.get_ip_info()[0]
-                # except Exception as e:
-                except SystemExit:
-                    print('Exception from update_current_connection(): SystemExit')  # noqa
-                    print('reconnect cmd sent')
-                    self.exec_cmd('protonvpn reconnect')
-
-            self.ids.main_screen.ids.exit_server_ip.text = f'IP: {ip}'
-
             connected_server = None
 
             try:
-                connected_server = pvpncli_utils.get_config_value(
+                connected_server = pvpn_config.get(
                     "metadata",
                     "connected_server",
                 )
@@ -253,35 +413,28 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
             except KeyError:
                 self.last_known_connection = None
 
+            self.update_exit_ip()
+
             # Set Secure Core switch if app newly initialized. Otherwise the
             # switch state is determined by User interaction afterwards.
+            server = self.server_catalog.get(connected_server) or {}
             if self.app_newly_initialized:
-                feature = pvpncli_utils.get_server_value(
-                    connected_server,
-                    "Features",
-                    servers,
-                )
+                feature = server.get("Features")
                 if feature == 1:
                     self.secure_core.state = 'down'
                 else:
                     self.secure_core.state = 'normal'
 
             self.app_newly_initialized = False
-            country_code = pvpncli_utils.get_server_value(
-                connected_server,
-                "ExitCountry",
-                servers,
-            )
-            cnxn_window = self.ids.main_screen.ids.connection_window
-            flag = f'./images/flags/large/{country_code.lower()}-large.jpg'
-            cnxn_window.img_source = flag
+            country_code = server.get("ExitCountry", "")
+            self.set_connection_image(countries.large_flag(country_code))
 
-            country = pvpncli_utils.get_country_name(country_code)
+            country = self.server_catalog.country_name(country_code)
             exit_server_info = f'{country} >> {connected_server}'
             self.ids.main_screen.ids.exit_server.text = exit_server_info
             self.ids.main_screen.ids.exit_server.color = [1, 1, 1, 1]
 
-            connected_protocol = pvpncli_utils.get_config_value(
+            connected_protocol = pvpn_config.get(
                 "metadata",
                 "connected_proto",
             )
@@ -289,12 +442,11 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
                 f'OpenVPN ({connected_protocol.upper()})'
             )
 
-            load = pvpncli_utils.get_server_value(
-                connected_server,
-                "Load",
-                servers,
+            # Unknown if the server isn't in the current server data.
+            load = server.get("Load")
+            self.ids.main_screen.ids.exit_server_load.text = (
+                '' if load is None else f'{load}% Load'
             )
-            self.ids.main_screen.ids.exit_server_load.text = f'{load}% Load'
 
             down = self.ids.main_screen.ids.bitrate_down_arrow
             down.source = './images/bitrate-download-arrow.png'
@@ -310,10 +462,6 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
             self.cnxn_wndw_btn.hover_img = './images/disconnect_hover.png'
             self.cnxn_wndw_btn.source = './images/disconnect.png'
 
-            # Schedule events
-            self.data_trans()
-            self.cnxn_time()
-
         else:
             # VPN isn't connected, so clear the conneciton info on screen.
             self.set_disconnected()
@@ -325,14 +473,12 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
         self.ids.main_screen.ids.exit_server.text = not_protected
         self.ids.main_screen.ids.exit_server.color = [1, 0, 0, 1]
 
-        cnxn_window = self.ids.main_screen.ids.connection_window
-        cnxn_window.img_source = './images/disconnected_window.png'
+        self.set_connection_image('./images/disconnected_window.png')
 
         self.ids.main_screen.ids.protocol.text = ''
         self.ids.main_screen.ids.exit_server_load.text = ''
 
-        ip = pvpncli_utils.get_ip_info()[0]
-        self.ids.main_screen.ids.exit_server_ip.text = f'IP: {ip}'
+        self.update_exit_ip()
 
         down = self.ids.main_screen.ids.bitrate_down_arrow
         down.source = './images/widget-background-transparent.png'
@@ -347,72 +493,174 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
         self.cnxn_wndw_btn.hover_img = './images/quick_connect_hover.png'
         self.cnxn_wndw_btn.source = './images/quick_connect.png'
 
-    def connection_changed(self, *dt):
-        """Compare current connection to last known; True = change."""
-        # Gather details of current connected server.
-        current_connection = pvpncli_utils.get_config_value(
-            "metadata",
-            "connected_server",
-        )
-        # Compare curren connection to last known connection.
-        if current_connection != self.last_known_connection:
-            return True
-        else:
+    def connection_key(self):
+        """Identify the current connection by server and OpenVPN pid."""
+        try:
+            server = pvpn_config.get("metadata", "connected_server")
+        except KeyError:
+            server = None
+        return (server, self.cnxn_watcher.pid)
+
+    def tunnel_ready(self):
+        """Determine if the current connection has completed."""
+        if self.management_client and self.management_client.connected:
+            return self.openvpn_state == 'CONNECTED'
+        # pvpn-cli records connected_time once connected; one older than
+        # the OpenVPN process is left from the previous connection.
+        started_at = self.cnxn_watcher.started_at
+        try:
+            connected_time = pvpn_config.get_int("metadata", "connected_time")
+        except (KeyError, ValueError):
             return False
+        return started_at is not None and connected_time >= int(started_at)
+
+    def update_exit_ip(self, *dt):
+        """Show the exit IP of the current connection, once it's up."""
+        key = self.connection_key() if self.vpn_connected else None
+        if key == self.exit_ip_key:
+            return
+        label = self.ids.main_screen.ids.exit_server_ip
+        if key is not None and not (key[0] and self.tunnel_ready()):
+            # Until then, a lookup would return the real IP.
+            label.text = 'IP: Checking...'
+            return
+        if key is not None:
+            # A lookup made while disconnected may have raced the tunnel.
+            self.ip_resolver.invalidate(None)
+        self.exit_ip_key = key
+        # Cached per server, so a reconnect to it is answered right away.
+        ip = self.ip_resolver.resolve(
+            None if key is None else key[0],
+            partial(self.exit_ip_resolved, key),
+        )
+        label.text = f'IP: {ip}' if ip else 'IP: Checking...'
+
+    def exit_ip_resolved(self, key, ip):
+        # Skip results for a connection that's no longer current.
+        if key != self.exit_ip_key:
+            return
+        label = self.ids.main_screen.ids.exit_server_ip
+        label.text = f'IP: {ip}' if ip else 'IP: Unavailable'
+
+    def set_connection_image(self, source):
+        """Show source in the connection window once it's decoded."""
+        self.connection_image = source
+        self.connection_images.request(
+            source,
+            partial(self.show_connection_image, source),
+        )
+
+    def show_connection_image(self, source, texture):
+        # Skip images superseded while they were loading.
+        if source == self.connection_image:
+            cnxn_window = self.ids.main_screen.ids.connection_window
+            cnxn_window.img_texture = texture
+
+    def preload_connection_images(self):
+        """Decode the images the connection window is likely to show."""
+        sources = ['./images/disconnected_window.png']
+        try:
+            last_server = pvpn_config.get("metadata", "connected_server")
+        except KeyError:
+            last_server = None
+        last_country = self.server_catalog.value(last_server, 'ExitCountry')
+        if last_country:
+            sources.append(countries.large_flag(last_country))
+        # Leave room in the cache for the current image.
+        limit = self.connection_images.max_size - len(sources) - 1
+        for code in self.server_catalog.ranked_countries(self.tier, limit):
+            sources.append(countries.large_flag(code))
+        self.connection_images.preload(sources)
 
     def check_current_cnxn(self, *dt):
-        """Update connection info if change detected."""
-        self.vpn_connected = self.is_connected()
+        """Sample connection status and update what changed on screen."""
+        status = self.status_sampler.sample()
+        self.vpn_connected = status.connected
+        # No-op if already ticking.
+        if status.connected:
+            self.status_check()
+        else:
+            self.status_check.cancel()
 
-        if self.vpn_connected:
-            if self.connection_changed():
+        if status.connected:
+            # Compare current connection to last known connection.
+            if status.server and status.server != self.last_known_connection:
                 self.update_current_connection()
+            else:
+                # Picks up the exit IP once the tunnel is up.
+                self.update_exit_ip()
         else:
             if self.last_known_connection:
                 self.set_disconnected()
 
-    def get_data_up_down(self, dt):
-        """Get data transferred during session."""
-        tx_amount, rx_amount = pvpncli_utils.get_transferred_data()
-        try:
-            self.ids.main_screen.ids.data_received.text = rx_amount
-            self.ids.main_screen.ids.data_sent.text = tx_amount
-        except Exception as e:
-            print('Exception from get_data_up_down(): ', e)
-
-    def get_connection_time(self, dt):
-        """Get duration of current connection."""
-        try:
-            last_connection = pvpncli_utils.get_config_value(
-                "metadata",
-                "connected_time",
-            )
-            if self.vpn_connected:
-                connection_time = time() - int(last_connection)
-                hours, remainder = divmod(connection_time, 3600)
-                mins, secs = divmod(remainder, 60)
-                self.ids.main_screen.ids.connection_time.text = (
-                    '{:02}:{:02}:{:02}'.format(int(hours), int(mins), int(secs))  # noqa
-                )
-            else:
-                if self.ids.main_screen.ids.connection_time.text != '':
-                    self.ids.main_screen.ids.connection_time.text = ''
-        except KeyError:
-            self.ids.main_screen.ids.connection_time.text = ''
+        # Only redraw labels whose values changed since the last sample.
+        labels = {
+            'connection_time': status.connection_time,
+            # Smoothed rate over the total transferred.
+            'data_sent': '\n'.join(
+                filter(None, (status.rate_sent, status.data_sent))
+            ),
+            'data_received': '\n'.join(
+                filter(None, (status.rate_received, status.data_received))
+            ),
+        }
+        for label_id, text in labels.items():
+            label = self.ids.main_screen.ids[label_id]
+            if label.text != text:
+                label.text = text
+        self.update_throughput_graphs()
+        self.update_server_data_age()
+
+    def update_throughput_graphs(self):
+        """Graph throughput since connecting (up to the last hour)."""
+        throughput = self.status_sampler.throughput
+        main_ids = self.ids.main_screen.ids
+        main_ids.bitrate_down_graph.set_values(throughput.down.values())
+        main_ids.bitrate_up_graph.set_values(throughput.up.values())
+
+    def update_server_data_age(self, *dt):
+        """Show how old the displayed server data is."""
+        age = format_data_age(self.server_catalog.pulled_at)
+        if self.server_data_offline:
+            text = f'Offline · data from {age}'
+        else:
+            text = f'Updated {age}'
+        label = self.ids.main_screen.ids.server_data_age
+        if label.text != text:
+            label.text = text
 
     def open_connecting_notification(self, cnxn):
         """Launch popup while a new connection attempt is in progress."""
+        # Replace any popup left open by a previous (cancelled) attempt.
+        self.close_connecting_notification()
         notification = f'Connecting to {cnxn}'
-        connecting_notification_popup = PvpnPopup(
+        self.connecting_notification_popup = PvpnPopup(
             title='New Connection',
             label_text=notification,
+            auto_close=False,
         )
-        connecting_notification_label = PvpnPopupLabel(
-            text=connecting_notification_popup.label_text,
+        self.connecting_notification_label = PvpnPopupLabel(
+            text=self.connecting_notification_popup.label_text,
             text_size=self.size,
         )
-        connecting_notification_popup.add_widget(connecting_notification_label)
-        connecting_notification_popup.open()
+        self.connecting_notification_popup.add_widget(
+            self.connecting_notification_label
+        )
+        self.connecting_notification_popup.open()
+
+    def update_connecting_notification(self, line):
+        """Show the latest CLI output line as connection progress."""
+        popup = self.connecting_notification_popup
+        if popup and line.strip():
+            self.connecting_notification_label.text = (
+                f'{popup.label_text}\n{line.strip()}'
+            )
+
+    def close_connecting_notification(self, *dt):
+        """Dismiss the connecting popup, if open."""
+        if self.connecting_notification_popup:
+            self.connecting_notification_popup.dismiss()
+            self.connecting_notification_popup = None
 
     def open_disconnecting_notification(self):
         """Launch popup while a disconnection attempt is in progress."""
@@ -451,38 +699,20 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
             self.sc_notification_open = True
             self.secure_core_notification_popup.open()
         else:
-            self.open_building_servertree_notification()
-            Clock.schedule_once(self.update_server_tree_info, 0.15)
+            self.show_server_view()
 
     def update_secure_core_notification_text(self, *dt):
-        """Indicate when 'Cancel'/'Continue' updates server tree."""
-        self.secure_core_notification_popup.label_text = (
-            'Rebuilding Server List...'
-        )
+        """Indicate when 'Continue' disconnects the VPN."""
+        self.secure_core_notification_popup.label_text = 'Disconnecting...'
         Clock.schedule_once(self.close_sc_notification, 0.1)
 
     def close_sc_notification(self, *dt):
-        """Update server list, disconnect VPN, and dismiss notification."""
-        self.update_server_tree_info()
+        """Switch server list, disconnect VPN, and dismiss notification."""
+        self.show_server_view()
         self.disconnect()
         self.set_sc_notification_close()
         self.secure_core_notification_popup.dismiss()
 
-    def open_building_servertree_notification(self):
-        """Launch popup while rebuilding server trees in progress."""
-        building_servertree_notification_popup = PvpnPopup(
-            title='Loading',
-            label_text="Building server list...",
-        )
-        building_servertree_notification_label = PvpnPopupLabel(
-            text=building_servertree_notification_popup.label_text,
-            text_size=self.size,
-        )
-        building_servertree_notification_popup.add_widget(
-            building_servertree_notification_label
-        )
-        building_servertree_notification_popup.open()
-
     def reset_secure_core_switch(self):
         """Set Secure Core switch to the prior position."""
         if self.secure_core.state == 'down':
@@ -493,89 +723,173 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
     def set_sc_notification_close(self):
         self.sc_notification_open = False
 
-    def update_server_tree_info(self, *dt):
-        """Remove and replace all server tree nodes with latest data."""
-        # Cancel scheduled updates, if event exists:
-        if self.update_server_tree:
-            self.update_server_tree.cancel()
-        # Collect data for building server tree nodes.
-        country_dict_list = self.build_country_dict_list()
-        country_flag_icons = self.get_flag_icons(country_dict_list)
-        servers_by_country = self.get_server_list()
-        treeview = self.ids.main_screen.ids.countries_panel.children[0]
-        # Gather a list of all nodes.
-        all_nodes = []
-        for country_node in treeview.iterate_all_nodes():
-            all_nodes.append(country_node)
-            child_nodes = country_node.nodes
-            for child_node in child_nodes:
-                all_nodes.append(child_node)
-        # Remove all current nodes from server tree.
-        for node in all_nodes:
-            treeview.remove_node(node)
-        # Repoopulate server tree with nodes using the latest data.
-        self.populate_server_tree(
-            treeview,
-            servers_by_country,
-            country_flag_icons,
+    def update_server_tree_info(self, done):
+        """Pull the latest server data in the background.
+
+        Called by the refresh coordinator; `done` is called once the server
+        list has been updated.
+        """
+        self.server_data_worker.refresh(
+            partial(self.server_data_ready, done),
+            partial(self.server_data_failed, done),
         )
+
+    def server_data_ready(self, done, server_catalog, *dt):
+        """Apply pulled server data, then report the refresh finished."""
+        self.apply_server_catalog(server_catalog)
+        done(True)
+        self.finish_startup_trace()
+
+    def apply_server_catalog(self, server_catalog, *dt):
+        """Update the server list in place with a freshly pulled catalog."""
+        self.server_catalog = server_catalog
+        self.server_data_offline = False
+        # Existing rows are kept, so the open country and the scroll
+        # position are preserved.
+        self.populate_server_tree(self.server_list, server_catalog)
+        self.preload_connection_images()
         # Update current connection with new info.
         self.update_current_connection()
-        # Reschedule server tree updates.
-        self.update_server_tree()
-
-    def build_country_dict_list(self):
-        """Build list of country dictionaries."""
-        country_dict_list = []
-        for code, name in pvpncli_country_codes.country_codes.items():
-            country_dict = {}
-            country_dict['code'] = code.lower()
-            country_dict['name'] = name
-            country_dict_list.append(country_dict)
-        return country_dict_list
-
-    def get_flag_icons(self, country_dict_list):
-        """Assign flag icons based on country code or name."""
-        country_dict_list = country_dict_list
-        for country in country_dict_list:
-            code = country.get('code')
-            country['small_flag'] = f'./images/flags/small/{code}_flag.png'
-        return country_dict_list
-
-    def get_server_list(self):
-        """Build list of servers by Country."""
-        # Check for latest data.
-        pvpncli_utils.pull_server_data(force=True)
-        # Get server details from raw server data.
-        servers_data = pvpncli_utils.get_servers()
-        # Compile dictionary of countries and server details; key=country name.
-        unsorted_countries = {}
-        for server in servers_data:
-            country = pvpncli_utils.get_country_name(server['ExitCountry'])
-            if country not in unsorted_countries.keys():
-                unsorted_countries[country] = []
-
-            server_details = {}
-            server_name = server['Name']
-            server_details[server_name] = {}
-
-            for k, v in server.items():
-                server_details[server_name][k] = v
-
-            unsorted_countries[country].append(server_details)
-
-        # Alphabetize countries by country name.
-        sorted_countries = sorted(unsorted_countries.keys())
-
-        servers_by_country = {}
-        for country in sorted_countries:
-            servers_by_country[country] = unsorted_countries[country]
-
-        return servers_by_country
-
-    def populate_server_tree(self, server_tree, servers_by_country,
-                             country_flag_icons):
-        """Add tree nodes of available servers to the server tree."""
+
+    def server_data_failed(self, done, error, *dt):
+        """Keep the current server list and retry on the next update."""
+        self.server_data_offline = True
+        self.update_server_data_age()
+        done(False)
+        self.finish_startup_trace()
+
+    def finish_startup_trace(self):
+        """Startup ends with the first server data refresh."""
+        tracer.end('first server data refresh')
+        tracer.finish()
+
+    def populate_server_tree(self, server_list, server_catalog):
+        """
+        Sync the standard and Secure Core views with the latest data.
+
+        Both views are kept up to date from the same catalog, so toggling
+        Secure Core only swaps which one the server list shows.
+        """
+        added = updated = removed = 0
+        for secure_core in (False, True):
+            # Secure Core is unavailable below Plus, so skip its view.
+            if secure_core and self.secure_core.disabled:
+                continue
+            counts = self.sync_server_view(
+                self.server_views[secure_core],
+                server_catalog,
+                secure_core,
+            )
+            added += counts[0]
+            updated += counts[1]
+            removed += counts[2]
+        self.show_server_view(server_list)
+
+        pvpncli_logger.logger.debug(
+            f"Server list refresh: {added} added, {updated} updated, "
+            f"{removed} removed"
+        )
+
+    def show_server_view(self, server_list=None):
+        """Show the view matching the Secure Core switch's position."""
+        server_list = server_list or self.server_list
+        secure_core = self.secure_core.state == 'down'
+        server_list.set_rows(
+            self.server_views[secure_core]['countries'],
+            partial(self.build_server_rows, secure_core),
+        )
+
+    def sync_server_view(self, view, server_catalog, secure_core):
+        """
+        Sync one view's country rows with the latest data.
+
+        Countries are header rows with aggregate info (server count, lowest
+        load and features); their server rows are only built once opened,
+        see build_server_rows(). Existing rows are updated in place; only
+        countries that appeared or disappeared are added or removed. Returns
+        counts of rows added, updated and removed.
+        """
+        # Feature icons shown on country rows
+        features = {
+            2: 'tor-onion',
+            4: "p2p-arrows",
+        }
+        no_icon = image_source('./images/widget-background-transparent.png')
+        country_rows = view['country_rows']
+
+        # If Secure Core, skip SC countries (CH, SE, & IS). Only exit servers
+        # are displayed, not entry servers.
+        sc_countries = ['Iceland', 'Switzerland', 'Sweden']
+
+        # Determine the countries to display: those with servers the
+        # user's tier can connect to.
+        wanted = {}
+        for code in server_catalog.countries:
+            country = server_catalog.country_name(code)
+            if secure_core and country in sc_countries:
+                continue
+            # Only retrieve server info commensurate with user's tier.
+            summary = server_catalog.country_summary(
+                code,
+                int(self.tier),
+                secure_core,
+            )
+            if summary[0]:
+                wanted[country] = (code, summary)
+
+        added = updated = removed = 0
+
+        # Remove countries which disappeared.
+        for country in list(country_rows):
+            if country not in wanted:
+                del country_rows[country]
+                removed += 1
+
+        for country, (code, summary) in wanted.items():
+            country_row = country_rows.get(country)
+            if country_row is None:
+                country_row = {
+                    'viewclass': 'PvpnServerListCountryRow',
+                    'country_name': country,
+                    'flag_source': countries.small_flag(code),
+                }
+                country_rows[country] = country_row
+                added += 1
+            else:
+                updated += 1
+
+            count, min_load, country_features = summary
+            plural = 's' if count > 1 else ''
+            summary = f'{count} server{plural} · {min_load}% min'
+            country_row['server_summary'] = summary
+
+            # Add feature icon to country row if any server has the feature
+            # If Secure Core selected, skip features:
+            feature_icons = []
+            if not secure_core:
+                for feature, icon in features.items():
+                    if country_features & feature:
+                        feature_icons.append(
+                            image_source(f'./images/{icon}.png')
+                        )
+            feature_icons += [no_icon] * (2 - len(feature_icons))
+            country_row['feature_icon_1'] = feature_icons[0]
+            country_row['feature_icon_2'] = feature_icons[1]
+
+        # Countries stay in alphabetical order, including newly added ones.
+        view['countries'] = [country_rows[country] for country in wanted]
+        view['country_codes'] = {
+            country: code for country, (code, _) in wanted.items()
+        }
+        return added, updated, removed
+
+    def build_server_rows(self, secure_core, country):
+        """
+        Return server rows for an opened country in one view.
+
+        Rows are built from the current catalog each time the country is
+        opened, and dropped by the server list once it's closed.
+        """
         # Define features and tier levels
         features = {
             # 0: "normal",      # no icon applicable
@@ -588,148 +902,102 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
             # 1: "B",           # no icon applicable
             2: "plus-server",
         }
+        no_icon = image_source('./images/widget-background-transparent.png')
+        code = self.server_views[secure_core]['country_codes'].get(country)
+        user_tier = int(self.tier)
+
+        server_rows = []
+        for details in self.server_catalog.servers_in_country(code):
+            # Only retrieve server info commensurate with user's tier.
+            if details['Tier'] > user_tier:
+                continue
+            # If Secure Core is selected, only populate SC servers.
+            is_sc = bool(details['Features'] & SECURE_CORE)
+            if is_sc != secure_core:
+                continue
+            if secure_core:
+                tier = image_source('./images/plus-server.png')
+                feat = no_icon
+            else:
+                # Server tier
+                try:
+                    tier = image_source(
+                        f'./images/{server_tiers[details["Tier"]]}.png'
+                    )
+                except KeyError:
+                    tier = no_icon
+                # Server features
+                try:
+                    feat = image_source(
+                        f'./images/{features[details["Features"]]}.png'
+                    )
+                except KeyError:
+                    feat = no_icon
+            server_rows.append({
+                'viewclass': 'PvpnServerListServerRow',
+                'server_name': details['Name'],
+                'server_load': str(details['Load']) + '%',
+                'tier_source': tier,
+                'feature_source': feat,
+                'server_city': details['City'] or '',
+            })
+        return server_rows
 
-        # If Secure Core, remove SC countries (CH, SE, & IS). Only exit servers
-        # are displayed, not entry servers.
-        if self.secure_core.state == 'down':
-            sc_countries = ['Iceland', 'Switzerland', 'Sweden']
-            for country in sc_countries:
-                del servers_by_country[country]
-
-        user_tier = self.tier
+    def build_server_tree(self):
+        """Fill the server list in the countries panel."""
+        self.server_list = self.ids.main_screen.ids.countries_panel
+        # Country rows of the standard (False) and Secure Core (True) views,
+        # by country name, for incremental updates.
+        self.server_views = {
+            secure_core: {
+                'country_rows': {},
+                'countries': [],
+                'country_codes': {},
+            }
+            for secure_core in (False, True)
+        }
+        # Render saved server data right away, then revalidate it in the
+        # background; rows are updated in place once the pull finishes.
+        if len(self.server_catalog):
+            with tracer.phase('first server list build'):
+                self.populate_server_tree(
+                    self.server_list,
+                    self.server_catalog,
+                )
+        tracer.begin('first server data refresh')
+        self.server_refresh.request('startup')
 
-        # Create Country node
-        for country, servers in servers_by_country.items():
-            country_node = self.server_tree.add_node(
-                PvpnServerTreeCountryNode(is_open=False),
-                None,
-            )
-            country_node.ids.country_node_country_name.text = country
-            # Assign small flag icon for country.
-            for country_dict in country_flag_icons:
-                if country == country_dict['name']:
-                    country_node.ids.country_node_flag_icon.source = (
-                        country_dict['small_flag'])
-                    continue
-            # Add feature icon to country node if any server has the feature
-            # If Secure Core selected, skip features:
-            if self.secure_core.state == 'normal':
-                features_possible = list(features.keys())
-                features_possible.remove(1)
-                features_found = []
-                for server in servers:
-                    name = list(server)[0]
-                    feature = server[name]['Features']
-                    # if feature in features_possible and feature not in
-                    # features_found.
-                    if feature in features_possible:
-                        if feature not in features_found:
-                            img = Image(
-                                source=f'./images/{features[feature]}.png',
-                                size_hint=(0.75, 0.75),
-                                pos_hint={'x': 0, 'center_y': 0.5},
-                            )
-                            country_node.ids.country_node_features_layout.add_widget(img) # noqa
-                            features_found.append(feature)
-
-            # For each country, add server node for each server.
-            for server in servers:
-                # Gather server details.
-                name = list(server)[0]
-                load = str(server[name]['Load']) + '%'
-                server_tier = server[name]['Tier']
-                city = server[name]['City']
-                feature = server[name]['Features']
-                # Only retrieve server info commensurate with user's tier.
-                if server_tier <= int(user_tier):
-                    # If Secure Core is selected, only populate SC servers.
-                    if self.secure_core.state == 'down':
-                        if features.get(feature) == 'secure-core':
-                            # Add server node to country node.
-                            server_node = self.server_tree.add_node(
-                                PvpnServerTreeServerNode(),
-                                country_node,
-                            )
-                            # Server name
-                            server_node.ids.server_node_server_name.text = name
-                            # Add server load
-                            server_node.ids.server_node_server_load.text = load
-                            # Add server tier
-                            tier = './images/plus-server.png'
-                            server_node.ids.plus_server.source = tier
-                            # Add server features
-                            feat = './images/widget-background-transparent.png'
-                            server_node.ids.tor_or_p2p.source = feat
-                            # Add server city
-                            if city:
-                                server_node.ids.server_node_server_city.text = city # noqa
-                    else:
-                        if features.get(feature) != 'secure-core':
-                            # Add server node to country node.
-                            server_node = self.server_tree.add_node(
-                                PvpnServerTreeServerNode(),
-                                country_node,
-                            )
-                            # Add server name
-                            server_node.ids.server_node_server_name.text = name
-                            # Add server load
-                            server_node.ids.server_node_server_load.text = load
-                            # Add server tier
-                            try:
-                                tier = f'./images/{server_tiers[server_tier]}.png' # noqa
-                            except KeyError:
-                                tier = './images/widget-background-transparent.png' # noqa
-                            server_node.ids.plus_server.source = tier
-                            # Add server features
-                            try:
-                                feat = f'./images/{features[feature]}.png'
-                            except KeyError:
-                                feat = './images/widget-background-transparent.png' # noqa
-                            server_node.ids.tor_or_p2p.source = feat
-                            # Add server city
-                            if city:
-                                server_node.ids.server_node_server_city.text = city # noqa
+    def exec_cmd(self, cmd, *dt, on_complete=None):
+        """
+        Run cmd on the command runner without blocking the UI.
 
-    def build_server_tree(self):
-        """Create treeview for server list and add it to scrollviewer."""
-        # Cancel scheduled updates, if event exists:
-        if self.update_server_tree:
-            self.update_server_tree.cancel()
-        # Gather data for compiling server tree
-        country_dict_list = self.build_country_dict_list()
-        country_flag_icons = self.get_flag_icons(country_dict_list)
-        servers_by_country = self.get_server_list()
-
-        self.server_tree = PvpnTreeView(
-            root_options=dict(text='Servers', is_open=True),
-            hide_root=True,
-        )
-        self.server_tree.size_hint_y = None
-        self.server_tree.bind(minimum_height=self.server_tree.setter('height'))
-        self.populate_server_tree(
-            self.server_tree,
-            servers_by_country,
-            country_flag_icons,
-        )
-        self.ids.main_screen.ids.countries_panel.add_widget(self.server_tree)
-        # Reschedule server tree updates.
-        self.update_server_tree()
-
-    def get_country_code(self, country):
-        """Return country code for country name provided."""
-        country_codes = pvpncli_country_codes.country_codes
-        for code, name in country_codes.items():
-            if name == country:
-                return code
-
-    def exec_cmd(self, cmd, *dt):
-        """Send cmd to command shell."""
+        Output lines are shown in the connecting popup. If on_complete is
+        provided, it's called with the finished job to continue a multi-step
+        action, and the popup is left open for the next step.
+        """
         self.cmd = cmd
-        try:
-            subprocess.check_output(self.cmd, shell=True).decode()
-        except subprocess.CalledProcessError as e:
-            print('Exception from exec_cmd(): ', e)
-            print('check_current_cnxn() called: ', self.check_current_cnxn())
+        return self.cmd_runner.run(
+            cmd,
+            on_output=self.update_connecting_notification,
+            on_complete=partial(self.cmd_complete, on_complete),
+        )
+
+    def cmd_complete(self, on_complete, job):
+        """Handle a finished command started by exec_cmd."""
+        if not job.succeeded:
+            print('Exception from exec_cmd(): ', job.cmd, job.returncode)
+        # Connection metadata is written once the command completes, so
+        # re-check now rather than relying on the process watcher alone.
+        self.cnxn_watcher.rescan()
+        self.check_current_cnxn()
+        if on_complete:
+            on_complete(job)
+            return
+        if job.succeeded:
+            self.close_connecting_notification()
+        else:
+            # Leave the CLI's last output (the error) visible for a moment.
+            Clock.schedule_once(self.close_connecting_notification, 3)
 
     # TODO
     # def quick_connect(self, trigger, country=None):
@@ -742,6 +1010,8 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
         country = country
         server_name = server_name
         protocol = self.default_protocol
+        # A new selection replaces any connection attempt still in progress.
+        self.cancel_commands()
         # If random is provided, connect to random server.
         if random:
             cmd = f'protonvpn c -r -p {protocol}'
@@ -754,23 +1024,39 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
                 self.fastest_sc_by_country(country)
                 return
             else:
-                cc = self.get_country_code(country)
-                cmd = f'protonvpn connect --cc {cc} -p {protocol}'
+                cc = countries.country_code(country)
                 cnxn = f'the fastest server in {country}'
+                self.open_connecting_notification(cnxn)
+                self.connect_fastest(
+                    self.server_catalog.connect_candidates(
+                        self.tier,
+                        exit_country=cc,
+                    ),
+                    protocol,
+                    f'protonvpn connect --cc {cc} -p {protocol}',
+                )
+                return
         # If server name provided, connect to that server.
         if server_name:
             cmd = f'protonvpn c {server_name} -p {protocol}'
             cnxn = f'server {server_name}'
         # If neither country or server name provided, connect to fastest server. # noqa
         if not country and not server_name and not random:
-            cmd = f'protonvpn c -f -p {protocol}'
-            cnxn = 'the fastest server'
+            self.open_connecting_notification('the fastest server')
+            self.connect_fastest(
+                self.server_catalog.connect_candidates(self.tier),
+                protocol,
+                f'protonvpn c -f -p {protocol}',
+            )
+            return
         self.open_connecting_notification(cnxn)
-        Clock.schedule_once(partial(self.exec_cmd, cmd), 0.1)
+        self.exec_cmd(cmd)
 
     def disconnect(self, *dt):
         """Call exec_cmd to disconnect vpn."""
         cmd = 'protonvpn d'
+        self.cancel_commands()
+        self.close_connecting_notification()
         self.open_disconnecting_notification()
         self.exec_cmd(cmd)
 
@@ -779,41 +1065,109 @@ class ProtonVpnGui(ScreenManager, BoxLayout):
         pvpncli_logger.logger.debug("Starting fastest SC country connect")
 
         if not protocol:
-            protocol = pvpncli_utils.get_config_value(
+            protocol = pvpn_config.get(
                 "USER",
                 "default_protocol"
             )
 
-        country_code = self.get_country_code(country)
-
-        self.exec_cmd('protonvpn d')
-        pvpncli_utils.pull_server_data(force=True)
+        country_code = countries.country_code(country)
 
-        servers = pvpncli_utils.get_servers()
+        self.exec_cmd(
+            'protonvpn d',
+            on_complete=partial(
+                self.connect_fastest_sc,
+                country_code,
+                protocol,
+            ),
+        )
 
-        # ProtonVPN Features: 1: SECURE-CORE, 2: TOR, 4: P2P
-        server_pool = []
-        for server in servers:
-            if server["Features"] == 1 \
-               and server["ExitCountry"] == country_code:
-                server_pool.append(server)
+    def connect_fastest_sc(self, country_code, protocol, *dt):
+        """Second step of fastest_sc_by_country, once disconnected."""
+        # Through the coordinator, so the pull and the rebuild of the
+        # server list are shared with any other refresh.
+        self.server_refresh.request(
+            'Secure Core connect',
+            partial(self.connect_fastest_sc_server, country_code, protocol),
+        )
 
+    def connect_fastest_sc_server(self, country_code, protocol, succeeded):
+        """Final step of fastest_sc_by_country, once server data pulled."""
+        if not succeeded:
+            self.close_connecting_notification()
+            return
+        server_pool = self.server_catalog.connect_candidates(
+            self.tier,
+            secure_core=True,
+            exit_country=country_code,
+        )
+        if not server_pool:
+            self.close_connecting_notification()
+            return
         fastest_server = pvpncli_utils.get_fastest_server(server_pool)
-        cmd = f'protonvpn c {fastest_server} -p {protocol}'
-        Clock.schedule_once(partial(self.exec_cmd, cmd), 0.1)
+        self.connect_fastest(
+            server_pool,
+            protocol,
+            f'protonvpn c {fastest_server} -p {protocol}',
+        )
 
     def do_quickconnect_or_disconnect(self, *args):
         if self.vpn_connected:
             self.disconnect()
         else:
-            if self.secure_core.state == 'down':
+            secure_core = self.secure_core.state == 'down'
+            if secure_core:
                 cmd = 'protonvpn connect --sc'
                 cnxn = 'the fastest Secure Core server...'
             else:
                 cmd = 'protonvpn connect --fastest'
                 cnxn = 'the fastest server...'
+            self.cancel_commands()
             self.open_connecting_notification(cnxn)
-            Clock.schedule_once(partial(self.exec_cmd, cmd), 0.1)
+            self.connect_fastest(
+                self.server_catalog.connect_candidates(
+                    self.tier,
+                    secure_core=secure_core,
+                ),
+                self.default_protocol,
+                cmd,
+            )
+
+    def cancel_commands(self):
+        """Cancel CLI commands and pending fastest server picks."""
+        self.connect_attempt += 1
+        self.cmd_runner.cancel()
+
+    def connect_fastest(self, servers, protocol, fallback_cmd):
+        """
+        Connect to whichever of servers has the best latency and load.
+
+        Servers are probed from here, so only while disconnected (probes
+        would otherwise go through the tunnel); fallback_cmd, which picks
+        by Score, runs instead while connected or if none can be reached.
+        """
+        if self.vpn_connected or not servers:
+            self.exec_cmd(fallback_cmd)
+            return
+        self.latency_prober.fastest(
+            servers,
+            partial(
+                self.connect_probed_server,
+                self.connect_attempt,
+                protocol,
+                fallback_cmd,
+            ),
+        )
+
+    def connect_probed_server(self, attempt, protocol, fallback_cmd,
+                              server_name):
+        """Connect to the server picked by connect_fastest."""
+        if attempt != self.connect_attempt:
+            # Replaced by another connect/disconnect while probing.
+            return
+        if server_name:
+            self.exec_cmd(f'protonvpn c {server_name} -p {protocol}')
+        else:
+            self.exec_cmd(fallback_cmd)
 
     def show_window(self):
         """Bring minimized and/or hidden App window to the forefront."""
@@ -844,85 +1198,54 @@ class ProtonVpnGuiApp(App):
         """Instatiate the App class and return an instance to run."""
 
         self.title = 'ProtonVPN GUI'
-        self.protonvpn_gui = ProtonVpnGui()
+        # Created first: the welcome screen checks for updates as soon as
+        # the root widget is built.
+        self.update_checker = UpdateChecker(
+            VERSION,
+            ProtonVpnGui.run_on_ui_thread,
+        )
+        with tracer.phase('build root widget'):
+            self.protonvpn_gui = ProtonVpnGui()
         return self.protonvpn_gui
 
-    def get_latest_version(self):
-        """Return the latest version from pypi"""
-        pvpncli_logger.logger.debug("Calling pypi API")
-        try:
-            r = requests.get("https://pypi.org/pypi/protonvpn-cli-gui/json")
-        except (requests.exceptions.ConnectionError,
-                requests.exceptions.ConnectTimeout):
-            pvpncli_logger.logger.debug("Couldn't connect to pypi API")
-            return False
-        try:
-            r.raise_for_status()
-        except requests.exceptions.HTTPError:
-            pvpncli_logger.logger.debug(
-                "HTTP Error with pypi API: {0}".format(r.status_code)
-            )
-            return False
+    def on_start(self):
+        """Runs before the first frame; mark when the frame is drawn."""
+        Clock.schedule_once(lambda dt: tracer.mark(FIRST_FRAME))
 
-        release = r.json()["info"]["version"]
-        return release
+    def on_stop(self):
+        """Stop background watchers when the app closes."""
+        for name in ('cnxn_watcher', 'management_client', 'cli_helper'):
+            watcher = getattr(self.protonvpn_gui, name, None)
+            if watcher:
+                watcher.stop()
+        # Leave pvpn-cli's OpenVPN template as it was found.
+        if getattr(self.protonvpn_gui, 'management_client', None):
+            remove_management_directive()
 
     def check_update(self):
-        """Return the download URL if Update is available, False otherwise"""
-
-        pvpncli_logger.logger.debug("Checking for new update")
-        current_version = list(VERSION.split("."))
-        current_version = [int(i) for i in current_version]
-        pvpncli_logger.logger.debug(f"Current: {current_version}")
-
-        latest_version = self.get_latest_version()
-        if not latest_version:
-            # Skip if get_latest_version() ran into errors
-            return
-
-        latest_version = latest_version.split(".")
-        latest_version = [int(i) for i in latest_version]
-        pvpncli_logger.logger.debug(f"Latest: {latest_version}")
-
-        for idx, i in enumerate(latest_version):
-            if i > current_version[idx]:
-                pvpncli_logger.logger.debug("Update found")
-                update_available = True
-                break
-            elif i < current_version[idx]:
-                pvpncli_logger.logger.debug("No update")
-                update_available = False
-                break
-        else:
-            pvpncli_logger.logger.debug("No update")
-            update_available = False
-
-        pvpncli_utils.set_config_value(
-            "metadata",
-            "last_update_check",
-            int(time())
+        """Check for an update in the background; show a popup if found."""
+        self.update_checker.check(self.show_update_available)
+
+    def show_update_available(self, latest_version):
+        """Tell the user a newer release is available."""
+        update_available_popup = PvpnPopup(
+            title='Update Available!',
+            label_text=(
+                f"protonvpn-cli-gui v{latest_version} is now available."
+            ),
+            dt=5,
+        )
+        update_available_popup_label = PvpnPopupLabel(
+            text=update_available_popup.label_text,
+            text_size=(400, 400),
+        )
+        update_available_popup.add_widget(
+            update_available_popup_label
+        )
+        Clock.schedule_once(
+            update_available_popup.open,
+            1,
         )
-
-        if update_available:
-            latest_version = '.'.join([str(x) for x in latest_version])
-            update_available_popup = PvpnPopup(
-                title='Update Available!',
-                label_text=(
-                    f"protonvpn-cli-gui v{latest_version} is now available."
-                ),
-                dt=5,
-            )
-            update_available_popup_label = PvpnPopupLabel(
-                text=update_available_popup.label_text,
-                text_size=(400, 400),
-            )
-            update_available_popup.add_widget(
-                update_available_popup_label
-            )
-            Clock.schedule_once(
-                update_available_popup.open,
-                1,
-            )
 
 
 # Instantiate App class and run the app.
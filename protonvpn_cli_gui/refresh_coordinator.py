@@ -0,0 +1,108 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+from time import time
+
+# Kivy Libraries
+from kivy.clock import Clock
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import logger as pvpncli_logger
+
+
+class RefreshCoordinator(object):
+    """
+    Run server list refreshes one at a time, whatever triggered them.
+
+    Triggers go through request(reason). Requests made within `debounce`
+    seconds of each other (e.g., rapid Secure Core toggling) collapse into
+    one refresh. Requests made while a refresh is in flight join it, since
+    the rebuild at its end already reflects the latest switch state. A
+    periodic refresh runs `interval` seconds after the last one finished.
+    A request's `on_done(succeeded)`, if given, is called once the refresh
+    covering it completes.
+
+    `refresh(done)` starts a refresh and must call `done(succeeded)` on the
+    UI thread once it completes.
+    """
+
+    def __init__(self, refresh, interval=300, debounce=0.3):
+        self.refresh = refresh
+        self.interval = interval
+        self.in_flight = False
+        self.last_finished = None
+        self._reasons = []
+        self._callbacks = []
+        self._started = None
+        self._trigger = Clock.create_trigger(self._start, debounce)
+        self._periodic = Clock.schedule_once(self._periodic_refresh, interval)
+
+    def request(self, reason, on_done=None):
+        """Ask for a refresh; reason is reported in the debug log."""
+        self._reasons.append(reason)
+        if on_done:
+            self._callbacks.append(on_done)
+        if self.in_flight:
+            pvpncli_logger.logger.debug(
+                f"Server list refresh ({reason}) joined the one in flight"
+            )
+            return
+        # Restart the debounce window.
+        self._trigger.cancel()
+        self._trigger()
+
+    def cancel(self):
+        """Stop pending and periodic refreshes."""
+        self._trigger.cancel()
+        self._periodic.cancel()
+
+    def _periodic_refresh(self, *dt):
+        self.request('interval')
+
+    def _start(self, *dt):
+        if self.in_flight or not self._reasons:
+            return
+        self._periodic.cancel()
+        reasons = ', '.join(dict.fromkeys(self._reasons))
+        self._reasons = []
+        self.in_flight = True
+        self._started = time()
+        since_last = ''
+        if self.last_finished:
+            since_last = f', {self._started - self.last_finished:.0f}s after the last one'  # noqa
+        pvpncli_logger.logger.debug(
+            f"Server list refresh started ({reasons}{since_last})"
+        )
+        self.refresh(self._done)
+
+    def _done(self, succeeded=True):
+        self.in_flight = False
+        self.last_finished = time()
+        pvpncli_logger.logger.debug(
+            f"Server list refresh {'finished' if succeeded else 'failed'} "
+            f"in {self.last_finished - self._started:.2f}s"
+        )
+        # Requests that joined this refresh are covered by it.
+        self._reasons = []
+        callbacks, self._callbacks = self._callbacks, []
+        self._periodic = Clock.schedule_once(
+            self._periodic_refresh,
+            self.interval,
+        )
+        for on_done in callbacks:
+            on_done(succeeded)
@@ -0,0 +1,264 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+from array import array
+import copy
+import sys
+
+# Local
+from . import countries
+
+# ProtonVPN Features: 1: SECURE-CORE, 2: TOR, 4: P2P
+SECURE_CORE = 1
+TOR = 2
+P2P = 4
+
+# Columns kept per server: field name -> array typecode, or None for
+# interned strings kept in a list.
+COLUMNS = {
+    'Name': None,
+    'EntryCountry': None,
+    'ExitCountry': None,
+    'City': None,
+    'Domain': None,
+    'EntryIP': None,
+    'Load': 'B',
+    'Tier': 'B',
+    'Features': 'H',
+    'Status': 'B',
+    'Score': 'd',
+}
+
+
+def _intern(value):
+    return sys.intern(value) if value else value
+
+
+class ServerRecord(object):
+    """
+    Read-only view of one server row in a ServerCatalog.
+
+    Supports the same item access as the raw server dicts (e.g.,
+    server['Load'], server.get('City')) for the fields in COLUMNS.
+    """
+
+    __slots__ = ('catalog', 'row')
+
+    def __init__(self, catalog, row):
+        self.catalog = catalog
+        self.row = row
+
+    def __getitem__(self, key):
+        return self.catalog.columns[key][self.row]
+
+    def get(self, key, default=None):
+        column = self.catalog.columns.get(key)
+        if column is None:
+            return default
+        return column[self.row]
+
+    def __repr__(self):
+        return f"<ServerRecord {self['Name']}>"
+
+
+class ServerCatalog(object):
+    """
+    Indexed, columnar store of a single server data pull.
+
+    Built once from pvpncli_utils.get_servers(), so lookups by name, exit
+    country, tier and Secure Core exit country are O(1) or O(k) instead of
+    a rescan of the raw server list. Numeric fields are kept
+    in arrays and strings are interned; the raw payload isn't retained.
+    """
+
+    def __init__(self, servers=(), columns=None, pulled_at=None):
+        """
+        Build from raw server dicts, or from previously saved `columns`.
+
+        `pulled_at` is the time (epoch seconds) the data was pulled.
+        """
+        self.pulled_at = pulled_at
+        if columns is None:
+            self.columns = {
+                key: array(typecode) if typecode else []
+                for key, typecode in COLUMNS.items()
+            }
+            for server in servers:
+                self._append(server)
+        else:
+            self.columns = columns
+        self.by_name = {}
+        self.by_country = {}
+        self.by_tier = {}
+        self.sc_by_exit_country = {}
+        self.country_names = {}
+
+        for row in range(len(self)):
+            exit_country = self.columns['ExitCountry'][row]
+            self.by_name[self.columns['Name'][row]] = row
+            self._index(self.by_country, exit_country, row)
+            self._index(self.by_tier, self.columns['Tier'][row], row)
+            if self.columns['Features'][row] & SECURE_CORE:
+                self._index(self.sc_by_exit_country, exit_country, row)
+            if exit_country not in self.country_names:
+                self.country_names[exit_country] = (
+                    countries.country_name(exit_country)
+                )
+
+        # Countries alphabetized by country name.
+        self.countries = sorted(
+            self.by_country,
+            key=lambda code: self.country_names[code],
+        )
+
+    def repulled(self, pulled_at):
+        """Return a copy pulled at pulled_at, sharing this catalog's data."""
+        catalog = copy.copy(self)
+        catalog.pulled_at = pulled_at
+        return catalog
+
+    def _append(self, server):
+        """Add one raw server dict as a new row."""
+        try:
+            entry_ip = server['Servers'][0]['EntryIP']
+        except (KeyError, IndexError):
+            entry_ip = None
+        columns = self.columns
+        columns['Name'].append(_intern(server['Name']))
+        columns['EntryCountry'].append(_intern(server['EntryCountry']))
+        columns['ExitCountry'].append(_intern(server['ExitCountry']))
+        columns['City'].append(_intern(server.get('City')))
+        columns['Domain'].append(server.get('Domain'))
+        columns['EntryIP'].append(entry_ip)
+        columns['Load'].append(server.get('Load', 0))
+        columns['Tier'].append(server['Tier'])
+        columns['Features'].append(server['Features'])
+        columns['Status'].append(server.get('Status', 1))
+        columns['Score'].append(server.get('Score', 0))
+
+    def _index(self, index, key, row):
+        rows = index.get(key)
+        if rows is None:
+            rows = index[key] = array('I')
+        rows.append(row)
+
+    def _records(self, rows):
+        return [ServerRecord(self, row) for row in rows]
+
+    def __len__(self):
+        return len(self.columns['Name'])
+
+    def get(self, name):
+        """Return the server named name, or None."""
+        row = self.by_name.get(name)
+        if row is None:
+            return None
+        return ServerRecord(self, row)
+
+    def value(self, name, key):
+        """Return a specific value of the server named name, or None."""
+        row = self.by_name.get(name)
+        if row is None:
+            return None
+        return self.columns[key][row]
+
+    def country_name(self, code):
+        """Return the country name for an exit country code."""
+        return self.country_names.get(code, code)
+
+    def servers_in_country(self, code):
+        """Return all servers exiting in country code."""
+        return self._records(self.by_country.get(code, ()))
+
+    def country_summary(self, code, max_tier, secure_core=False):
+        """
+        Return (count, min_load, features) for servers in country code.
+
+        Only servers up to max_tier that are Secure Core servers if
+        secure_core, or that aren't otherwise, are counted. features is
+        their Features bitmasks combined.
+        """
+        tiers = self.columns['Tier']
+        loads = self.columns['Load']
+        all_features = self.columns['Features']
+        count = 0
+        min_load = None
+        features = 0
+        for row in self.by_country.get(code, ()):
+            if tiers[row] > max_tier:
+                continue
+            if bool(all_features[row] & SECURE_CORE) != secure_core:
+                continue
+            features |= all_features[row]
+            count += 1
+            if min_load is None or loads[row] < min_load:
+                min_load = loads[row]
+        return count, min_load, features
+
+    def ranked_countries(self, max_tier, limit=None):
+        """
+        Return country codes ordered by their best (lowest) server Score.
+
+        Only non-Secure Core servers up to max_tier are considered.
+        """
+        tiers = self.columns['Tier']
+        features = self.columns['Features']
+        scores = self.columns['Score']
+        best = {}
+        for code, rows in self.by_country.items():
+            for row in rows:
+                if tiers[row] > max_tier or features[row] & SECURE_CORE:
+                    continue
+                if code not in best or scores[row] < best[code]:
+                    best[code] = scores[row]
+        return sorted(best, key=best.get)[:limit]
+
+    def connect_candidates(self, max_tier, secure_core=False,
+                           exit_country=None):
+        """
+        Return the servers a fastest-server connect picks from.
+
+        Like pvpn-cli: Secure Core servers if secure_core, otherwise
+        servers that are neither Secure Core nor Tor; only servers up to
+        max_tier, and exiting in exit_country if given.
+        """
+        if exit_country is not None:
+            if secure_core:
+                rows = self.sc_by_exit_country.get(exit_country, ())
+            else:
+                rows = self.by_country.get(exit_country, ())
+        else:
+            rows = sorted(
+                row
+                for tier, tier_rows in self.by_tier.items()
+                if tier <= max_tier
+                for row in tier_rows
+            )
+        tiers = self.columns['Tier']
+        features = self.columns['Features']
+        selected = []
+        for row in rows:
+            if tiers[row] > max_tier:
+                continue
+            if secure_core:
+                if not features[row] & SECURE_CORE:
+                    continue
+            elif features[row] & (SECURE_CORE | TOR):
+                continue
+            selected.append(row)
+        return self._records(selected)
@@ -0,0 +1,221 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+from array import array
+import json
+import os
+import struct
+import sys
+import threading
+from time import time
+import zlib
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import constants as pvpncli_constants
+from protonvpn_cli import logger as pvpncli_logger
+from protonvpn_cli import utils as pvpncli_utils
+
+# Local
+from .api_client import ServerListClient
+from .config_cache import pvpn_config
+from .server_catalog import COLUMNS, ServerCatalog
+
+# Last good server catalog, used to render the server list at startup and
+# while the API is unreachable.
+SNAPSHOT_FILE = os.path.join(
+    pvpncli_constants.CONFIG_DIR,
+    'pvpn-gui-servers.snapshot',
+)
+# File magic/version, followed by the pull time as a big-endian double and
+# the lengths of the ETag and Last-Modified validators, then the validators.
+SNAPSHOT_MAGIC = b'PVPNGUI\x02'
+SNAPSHOT_HEADER = struct.Struct('>dHH')
+
+
+def save_snapshot(catalog, path=None, etag=None, last_modified=None):
+    """Write catalog's columns and its validators to a snapshot file."""
+    path = path or SNAPSHOT_FILE
+    columns = {key: list(column) for key, column in catalog.columns.items()}
+    body = zlib.compress(json.dumps(columns).encode(), 9)
+    etag = (etag or '').encode()
+    last_modified = (last_modified or '').encode()
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(SNAPSHOT_HEADER.pack(
+            catalog.pulled_at or time(),
+            len(etag),
+            len(last_modified),
+        ))
+        f.write(etag)
+        f.write(last_modified)
+        f.write(body)
+    os.replace(tmp_path, path)
+    # Written as root; hand it to the user, like the CLI's own files.
+    pvpncli_utils.change_file_owner(path)
+
+
+def read_snapshot(path=None):
+    """
+    Return (catalog, etag, last_modified) saved at path.
+
+    catalog is None if the snapshot is unavailable, and the validators are
+    None if they weren't saved.
+    """
+    try:
+        with open(path or SNAPSHOT_FILE, 'rb') as f:
+            data = f.read()
+        if not data.startswith(SNAPSHOT_MAGIC):
+            raise ValueError('unknown snapshot format')
+        offset = len(SNAPSHOT_MAGIC)
+        pulled_at, etag_size, last_modified_size = (
+            SNAPSHOT_HEADER.unpack_from(data, offset)
+        )
+        offset += SNAPSHOT_HEADER.size
+        etag = data[offset:offset + etag_size].decode()
+        offset += etag_size
+        last_modified = data[offset:offset + last_modified_size].decode()
+        offset += last_modified_size
+        saved = json.loads(zlib.decompress(data[offset:]).decode())
+        columns = {}
+        for key, typecode in COLUMNS.items():
+            if typecode:
+                columns[key] = array(typecode, saved[key])
+            else:
+                columns[key] = [
+                    sys.intern(value) if value else value
+                    for value in saved[key]
+                ]
+    except (OSError, ValueError, KeyError, struct.error, zlib.error) as e:
+        pvpncli_logger.logger.debug(f"No server list snapshot: {e}")
+        return None, None, None
+    catalog = ServerCatalog(columns=columns, pulled_at=pulled_at)
+    return catalog, etag or None, last_modified or None
+
+
+def load_snapshot(path=None):
+    """Return the ServerCatalog saved at path, or None if unavailable."""
+    return read_snapshot(path)[0]
+
+
+# Shared so every pull reuses one connection and the last response's
+# validators.
+server_list_client = ServerListClient()
+
+
+def cached_server_catalog():
+    """Return the last saved ServerCatalog, else the CLI's server data."""
+    catalog, etag, last_modified = read_snapshot()
+    if catalog is not None:
+        # The next pull can then be answered with a 304, unless the CLI's
+        # copy is gone and the full payload is needed to rewrite it.
+        if os.path.isfile(pvpncli_constants.SERVER_INFO_FILE):
+            server_list_client.restore(catalog, etag, last_modified)
+        return catalog
+    try:
+        pulled_at = pvpn_config.get_int("metadata", "last_api_pull")
+    except (KeyError, ValueError):
+        pulled_at = None
+    try:
+        return ServerCatalog(pvpncli_utils.get_servers(), pulled_at=pulled_at)
+    except (OSError, ValueError) as e:
+        pvpncli_logger.logger.debug(f"No cached server data: {e}")
+        return ServerCatalog()
+
+
+def pull_server_catalog():
+    """Return the latest server data as a ServerCatalog."""
+    catalog = server_list_client.fetch()[0]
+    # Saved after a 304 too, so the data age is right after a restart.
+    try:
+        save_snapshot(
+            catalog,
+            etag=server_list_client.etag,
+            last_modified=server_list_client.last_modified,
+        )
+    except OSError as e:
+        print('Exception from save_snapshot(): ', e)
+    return catalog
+
+
+def format_data_age(pulled_at, now=None):
+    """Describe how old server data pulled at pulled_at is."""
+    if not pulled_at:
+        return 'unknown'
+    age = max(0, (now or time()) - pulled_at)
+    if age < 60:
+        return 'just now'
+    if age < 3600:
+        return f'{int(age // 60)} min ago'
+    if age < 86400:
+        return f'{int(age // 3600)} h ago'
+    return f'{int(age // 86400)} d ago'
+
+
+class ServerDataWorker(object):
+    """
+    Download, parse and index server data off the UI thread.
+
+    refresh() returns immediately. Once the catalog is built,
+    `on_ready(catalog)` is handed to the UI thread via `dispatch`. If the
+    pull fails, `on_error(exception)` is dispatched instead, if provided.
+    Refreshes requested while a pull is in flight share its result rather
+    than starting another pull.
+    """
+
+    def __init__(self, dispatch, fetch=pull_server_catalog):
+        self.dispatch = dispatch
+        self.fetch = fetch
+        # Callbacks waiting on the in-flight pull; None when idle.
+        self._waiting = None
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self):
+        return self._waiting is not None
+
+    def refresh(self, on_ready, on_error=None):
+        """Start a background pull of the latest server data."""
+        with self._lock:
+            if self._waiting is not None:
+                self._waiting.append((on_ready, on_error))
+                return
+            self._waiting = [(on_ready, on_error)]
+        thread = threading.Thread(
+            target=self._run,
+            name='ServerDataWorker',
+            daemon=True,
+        )
+        thread.start()
+
+    def _run(self):
+        try:
+            result = self.fetch()
+            failed = False
+        # pvpncli_utils exits on API errors.
+        except (Exception, SystemExit) as e:
+            print('Exception from ServerDataWorker: ', e)
+            result = e
+            failed = True
+        with self._lock:
+            waiting, self._waiting = self._waiting, None
+        for on_ready, on_error in waiting:
+            if not failed:
+                self.dispatch(on_ready, result)
+            elif on_error:
+                self.dispatch(on_error, result)
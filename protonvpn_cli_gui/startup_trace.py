@@ -0,0 +1,256 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Startup tracer. Imported before kivy, so the trace flag can be taken out of
+# sys.argv before kivy parses the command line; standard library only.
+
+# Standard Libraries
+from contextlib import contextmanager
+import json
+import os
+import sys
+import tempfile
+import threading
+from time import perf_counter, strftime, time
+
+# Marks the app records; reported as time to first frame and to interactive.
+FIRST_FRAME = 'first frame'
+INTERACTIVE = 'interactive'
+# Set to 1, or to a directory for the reports, to trace startup.
+TRACE_ENV = 'PVPN_GUI_TRACE_STARTUP'
+# Same, from the command line: --trace-startup or --trace-startup=DIR
+TRACE_FLAG = '--trace-startup'
+
+
+def _process_age():
+    """Return seconds since this process started, if known."""
+    try:
+        with open('/proc/self/stat') as f:
+            # Fields after the command name, which may contain spaces.
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        started = int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+    return max(0.0, uptime - started)
+
+
+class StartupTracer(object):
+    """
+    Timestamp startup phases and write a report once startup finishes.
+
+    Phases are recorded with phase(name) (a context manager), or with
+    begin(name)/end(name) when a phase spans callbacks; both calls must
+    come from the same thread, so threads can run a phase of the same
+    name at once. finish() writes a JSON summary, including the time to
+    the FIRST_FRAME and INTERACTIVE marks, and a Chrome trace-event file
+    (chrome://tracing or Perfetto) to `output_dir`. Does nothing unless
+    enabled.
+    """
+
+    def __init__(self, enabled=False, output_dir=None):
+        self.enabled = enabled
+        self.output_dir = output_dir or tempfile.gettempdir()
+        self.origin = perf_counter()
+        self.started_at = time()
+        # Time the process ran before the tracer was imported.
+        self.process_age = _process_age() if enabled else None
+        self.phases = []
+        self.marks = []
+        # Start time and thread name of running phases, by (name, thread id).
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def _now(self):
+        return perf_counter() - self.origin
+
+    def begin(self, name):
+        """Start timing phase name on this thread."""
+        if self.enabled:
+            thread = threading.current_thread()
+            with self._lock:
+                self._open[(name, thread.ident)] = (self._now(), thread.name)
+
+    def end(self, name):
+        """Stop timing phase name on this thread, if started."""
+        if self.enabled:
+            self._close((name, threading.get_ident()))
+
+    def _close(self, key):
+        now = self._now()
+        with self._lock:
+            opened = self._open.pop(key, None)
+            if opened is None:
+                return
+            start, thread = opened
+            self.phases.append((key[0], start, now - start, thread))
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as phase name."""
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def mark(self, name):
+        """Record a point in time, e.g., the first frame."""
+        if self.enabled:
+            with self._lock:
+                self.marks.append((name, self._now()))
+
+    def mark_ms(self, name, since_process_start=False):
+        """Return when mark name was first recorded (ms), or None."""
+        for mark, at in self.marks:
+            if mark == name:
+                if since_process_start:
+                    if self.process_age is None:
+                        return None
+                    at += self.process_age
+                return round(at * 1000, 3)
+        return None
+
+    def report(self):
+        """Return the JSON report as a dict."""
+        total = max(
+            [start + duration for _, start, duration, _ in self.phases] +
+            [at for _, at in self.marks] +
+            [0.0]
+        )
+        return {
+            'started_at': self.started_at,
+            'process_age_at_start_ms': (
+                None if self.process_age is None
+                else round(self.process_age * 1000, 3)
+            ),
+            'total_ms': round(total * 1000, 3),
+            # From the tracer's import, and from process start.
+            'first_frame_ms': self.mark_ms(FIRST_FRAME),
+            'interactive_ms': self.mark_ms(INTERACTIVE),
+            'first_frame_since_process_start_ms': self.mark_ms(
+                FIRST_FRAME,
+                since_process_start=True,
+            ),
+            'interactive_since_process_start_ms': self.mark_ms(
+                INTERACTIVE,
+                since_process_start=True,
+            ),
+            'phases': [
+                {
+                    'name': name,
+                    'start_ms': round(start * 1000, 3),
+                    'duration_ms': round(duration * 1000, 3),
+                    'thread': thread,
+                }
+                for name, start, duration, thread in sorted(
+                    self.phases,
+                    key=lambda phase: phase[1],
+                )
+            ],
+            'marks': [
+                {'name': name, 'at_ms': round(at * 1000, 3)}
+                for name, at in self.marks
+            ],
+        }
+
+    def chrome_trace(self):
+        """Return the phases and marks as Chrome trace events."""
+        pid = os.getpid()
+        threads = {}
+        events = []
+        for name, start, duration, thread in self.phases:
+            tid = threads.setdefault(thread, len(threads) + 1)
+            events.append({
+                'name': name,
+                'cat': 'startup',
+                'ph': 'X',
+                'ts': round(start * 1e6),
+                'dur': round(duration * 1e6),
+                'pid': pid,
+                'tid': tid,
+            })
+        for name, at in self.marks:
+            events.append({
+                'name': name,
+                'cat': 'startup',
+                'ph': 'i',
+                's': 'g',
+                'ts': round(at * 1e6),
+                'pid': pid,
+                'tid': 1,
+            })
+        for thread, tid in threads.items():
+            events.append({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': pid,
+                'tid': tid,
+                'args': {'name': thread},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def finish(self):
+        """Write the reports and stop tracing; returns their paths."""
+        if not self.enabled:
+            return None
+        # Phases still running, on any thread, are reported up to now.
+        for key in list(self._open):
+            self._close(key)
+        self.enabled = False
+        base = os.path.join(
+            self.output_dir,
+            f'pvpn-gui-startup-{strftime("%Y%m%d-%H%M%S")}',
+        )
+        paths = (f'{base}.json', f'{base}.trace.json')
+        report = self.report()
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(paths[0], 'w') as f:
+                json.dump(report, f, indent=2)
+            with open(paths[1], 'w') as f:
+                json.dump(self.chrome_trace(), f)
+        except OSError as e:
+            print('Exception from StartupTracer.finish(): ', e)
+            return None
+        print(
+            f"Startup: first frame at {report['first_frame_ms']} ms, "
+            f"interactive at {report['interactive_ms']} ms "
+            f"({report['interactive_since_process_start_ms']} ms since the "
+            f"process started)"
+        )
+        print(f'Startup trace written to {paths[0]} and {paths[1]}')
+        return paths
+
+
+def _tracer_from_environment(argv):
+    """Return a tracer configured by TRACE_ENV or TRACE_FLAG."""
+    setting = os.environ.get(TRACE_ENV, '')
+    # Remove the flag so kivy's own argument parsing doesn't see it.
+    for arg in list(argv[1:]):
+        if arg == TRACE_FLAG or arg.startswith(f'{TRACE_FLAG}='):
+            argv.remove(arg)
+            setting = arg.partition('=')[2] or '1'
+    if setting in ('', '0'):
+        return StartupTracer()
+    output_dir = None if setting == '1' else setting
+    return StartupTracer(enabled=True, output_dir=output_dir)
+
+
+# Shared tracer; a no-op unless startup tracing was requested.
+tracer = _tracer_from_environment(sys.argv)
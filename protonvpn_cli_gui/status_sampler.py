@@ -0,0 +1,109 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+from collections import namedtuple
+from time import monotonic, time
+
+# Local
+from .config_cache import pvpn_config
+from .throughput import ThroughputMeter, format_bytes, format_rate
+
+
+# Seconds pushed byte counters are used for before sysfs is read again.
+PUSHED_COUNTERS_MAX_AGE = 3
+
+# Immutable result of a single status sample. Text fields are ready to be
+# assigned to the main screen labels as-is.
+StatusSnapshot = namedtuple('StatusSnapshot', [
+    'connected',
+    'server',
+    'protocol',
+    'connection_time',
+    'data_sent',
+    'data_received',
+    'rate_sent',
+    'rate_received',
+])
+
+
+def format_duration(seconds):
+    """Format seconds as HH:MM:SS."""
+    hours, remainder = divmod(int(seconds), 3600)
+    mins, secs = divmod(remainder, 60)
+    return '{:02}:{:02}:{:02}'.format(hours, mins, secs)
+
+
+class StatusSampler(object):
+    """
+    Collect everything the connection window displays in a single pass.
+
+    Process state comes from `is_connected` (the OpenVPN watcher), the
+    connection metadata from the cached pvpn-cli config, and the
+    byte counters and rates from the tunnel's ThroughputMeter. Byte
+    counters pushed by OpenVPN (set_counters()) are used while they're
+    recent; otherwise the meter reads them from sysfs.
+    """
+
+    def __init__(self, is_connected):
+        self.is_connected = is_connected
+        self.throughput = ThroughputMeter()
+        self.pushed_counters = None
+
+    def set_counters(self, rx, tx):
+        """Record byte counters reported by OpenVPN."""
+        self.pushed_counters = (monotonic(), rx, tx)
+
+    def sample(self):
+        """Return a StatusSnapshot of the current connection."""
+        connected = self.is_connected()
+        if not connected:
+            self.throughput.reset()
+            self.pushed_counters = None
+            return StatusSnapshot(False, None, None, '', '', '', '', '')
+
+        metadata = pvpn_config.section('metadata')
+        server = metadata.get('connected_server')
+        protocol = metadata.get('connected_proto')
+
+        connection_time = ''
+        connected_time = metadata.get('connected_time')
+        if connected_time:
+            connection_time = format_duration(time() - int(connected_time))
+
+        data_sent = data_received = rate_sent = rate_received = ''
+        counters = None
+        pushed = self.pushed_counters
+        if pushed and monotonic() - pushed[0] < PUSHED_COUNTERS_MAX_AGE:
+            counters = pushed[1:]
+        throughput = self.throughput.sample(counters=counters)
+        if throughput:
+            data_sent = format_bytes(throughput.tx_bytes)
+            data_received = format_bytes(throughput.rx_bytes)
+            rate_sent = format_rate(throughput.smooth_up)
+            rate_received = format_rate(throughput.smooth_down)
+
+        return StatusSnapshot(
+            connected,
+            server,
+            protocol,
+            connection_time,
+            data_sent,
+            data_received,
+            rate_sent,
+            rate_received,
+        )
@@ -0,0 +1,92 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+from collections import OrderedDict
+
+# Kivy Libraries
+from kivy.loader import Loader
+from kivy.resources import resource_find
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import logger as pvpncli_logger
+
+
+class TextureCache(object):
+    """
+    Bounded LRU cache of decoded image textures, loaded off the UI thread.
+
+    Images are decoded by Kivy's Loader worker threads; request() hands
+    the texture to its callback on the UI thread once it's ready, right
+    away if it's already cached. The `max_size` most recently used
+    textures are kept.
+    """
+
+    def __init__(self, max_size=8):
+        self.max_size = max_size
+        self._textures = OrderedDict()
+        # Images being loaded: source -> (proxy image, callbacks).
+        self._pending = {}
+
+    def get(self, source):
+        """Return the cached texture for source, or None."""
+        texture = self._textures.get(source)
+        if texture is not None:
+            self._textures.move_to_end(source)
+        return texture
+
+    def request(self, source, callback=None):
+        """Load source in the background and pass its texture to callback."""
+        texture = self.get(source)
+        if texture is not None:
+            if callback:
+                callback(texture)
+            return
+        pending = self._pending.get(source)
+        if pending:
+            if callback:
+                pending[1].append(callback)
+            return
+        proxy = Loader.image(resource_find(source) or source)
+        callbacks = [callback] if callback else []
+        self._pending[source] = (proxy, callbacks)
+        if proxy.loaded:
+            self._on_load(source, proxy)
+        else:
+            proxy.bind(on_load=lambda proxy: self._on_load(source, proxy))
+            proxy.bind(on_error=lambda proxy: self._on_error(source))
+
+    def preload(self, sources):
+        """Start loading sources so later requests are served from cache."""
+        for source in sources:
+            self.request(source)
+
+    def _on_load(self, source, proxy):
+        pending = self._pending.pop(source, None)
+        if pending is None:
+            return
+        texture = proxy.texture
+        self._textures[source] = texture
+        self._textures.move_to_end(source)
+        while len(self._textures) > self.max_size:
+            self._textures.popitem(last=False)
+        for callback in pending[1]:
+            callback(texture)
+
+    def _on_error(self, source):
+        self._pending.pop(source, None)
+        pvpncli_logger.logger.debug(f"Unable to load image: {source}")
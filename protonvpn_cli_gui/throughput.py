@@ -0,0 +1,192 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+from array import array
+from collections import namedtuple
+from math import exp
+import os
+from time import monotonic
+
+STATISTICS_PATH = '/sys/class/net/{0}/statistics/{1}'
+# Tunnel interfaces, in the order pvpn-cli looks for them.
+TUNNEL_INTERFACES = ('proton0', 'tun0')
+
+# Rates are in bytes per second; totals in bytes.
+ThroughputSample = namedtuple('ThroughputSample', [
+    'rx_bytes',
+    'tx_bytes',
+    'rate_down',
+    'rate_up',
+    'smooth_down',
+    'smooth_up',
+])
+
+
+def find_tunnel_interface():
+    """Return the name of the VPN tunnel interface, or None."""
+    for iface in TUNNEL_INTERFACES:
+        if os.path.isfile(STATISTICS_PATH.format(iface, 'rx_bytes')):
+            return iface
+    return None
+
+
+def read_counters(iface):
+    """Return the (rx, tx) byte counters of iface."""
+    counters = []
+    for name in ('rx_bytes', 'tx_bytes'):
+        with open(STATISTICS_PATH.format(iface, name)) as f:
+            counters.append(int(f.read()))
+    return tuple(counters)
+
+
+def format_bytes(size):
+    """Format a byte count, e.g., '12.34 MB'."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            break
+        size /= 1024
+    else:
+        unit = 'TB'
+    if unit == 'B':
+        return f'{int(size)} B'
+    return f'{size:.2f} {unit}'
+
+
+def format_rate(bytes_per_second):
+    """Format a rate in bytes per second as bits, e.g., '8.4 Mbps'."""
+    rate = bytes_per_second * 8
+    for unit in ('bps', 'Kbps', 'Mbps'):
+        if rate < 1000:
+            break
+        rate /= 1000
+    else:
+        unit = 'Gbps'
+    if unit == 'bps':
+        return f'{int(rate)} bps'
+    return f'{rate:.1f} {unit}'
+
+
+class RingBuffer(object):
+    """Fixed-size buffer of floats that overwrites its oldest values."""
+
+    def __init__(self, size):
+        self.size = size
+        self._values = array('d', bytes(8 * size))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+
+    def values(self):
+        """Return the stored values, oldest first."""
+        start = (self._next - self._count) % self.size
+        if start + self._count <= self.size:
+            return self._values[start:start + self._count]
+        return self._values[start:] + self._values[:self._next]
+
+
+class ThroughputMeter(object):
+    """
+    Measure tunnel throughput from the interface's byte counters.
+
+    Each sample() reads the counters from sysfs, unless it's given
+    counters from elsewhere (e.g., OpenVPN's management interface), and
+    computes the rate since the previous sample, plus an exponentially
+    weighted moving average with time constant `smoothing` seconds.
+    Per-sample rates are kept in ring buffers holding the last `history`
+    samples (an hour at one sample per second).
+    """
+
+    def __init__(self, history=3600, smoothing=5.0):
+        self.smoothing = smoothing
+        self.down = RingBuffer(history)
+        self.up = RingBuffer(history)
+        self.reset()
+
+    def reset(self):
+        """Forget the previous sample and the history."""
+        self.iface = None
+        self.source = None
+        self._last = None
+        self.smooth_down = 0.0
+        self.smooth_up = 0.0
+        self.down.clear()
+        self.up.clear()
+
+    def _read(self):
+        if self.iface is None:
+            self.iface = find_tunnel_interface()
+            if self.iface is None:
+                return None
+        try:
+            return read_counters(self.iface)
+        except (OSError, ValueError):
+            # The interface went away; look it up again next time.
+            self.iface = None
+            return None
+
+    def sample(self, now=None, counters=None):
+        """Return a ThroughputSample, or None if there's no tunnel."""
+        now = monotonic() if now is None else now
+        source = 'sysfs' if counters is None else 'pushed'
+        if counters is None:
+            counters = self._read()
+            if counters is None:
+                self._last = None
+                return None
+        if source != self.source:
+            # Counters from different sources aren't comparable.
+            self.source = source
+            self._last = None
+        rx, tx = counters
+        rate_down = rate_up = 0.0
+        last = self._last
+        self._last = (now, rx, tx)
+        # Counters restart when the tunnel is recreated; that sample only
+        # sets the new baseline.
+        if last and now > last[0] and rx >= last[1] and tx >= last[2]:
+            elapsed = now - last[0]
+            rate_down = (rx - last[1]) / elapsed
+            rate_up = (tx - last[2]) / elapsed
+            if len(self.down):
+                weight = 1 - exp(-elapsed / self.smoothing)
+                self.smooth_down += weight * (rate_down - self.smooth_down)
+                self.smooth_up += weight * (rate_up - self.smooth_up)
+            else:
+                self.smooth_down = rate_down
+                self.smooth_up = rate_up
+            self.down.append(rate_down)
+            self.up.append(rate_up)
+        return ThroughputSample(
+            rx,
+            tx,
+            rate_down,
+            rate_up,
+            self.smooth_down,
+            self.smooth_up,
+        )
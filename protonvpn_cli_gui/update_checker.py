@@ -0,0 +1,150 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Standard Libraries
+import requests
+import threading
+from time import time
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import logger as pvpncli_logger
+from protonvpn_cli import utils as pvpncli_utils
+
+# Local
+from .config_cache import pvpn_config
+
+PYPI_URL = 'https://pypi.org/pypi/protonvpn-cli-gui/json'
+# Days between checks when the config doesn't set check_update_interval.
+DEFAULT_CHECK_INTERVAL = 3
+
+
+def parse_version(version):
+    """Return a version string (e.g., '0.1.10') as a tuple of ints."""
+    return tuple(int(part) for part in version.split('.'))
+
+
+class UpdateChecker(object):
+    """
+    Check PyPI for a newer release without blocking the UI.
+
+    Checks run at most once per check_update_interval days (USER section),
+    counted from last_gui_update_check (metadata section); protonvpn-cli's
+    own last_update_check is left to the CLI. The latest version
+    found is cached in the config as latest_gui_version, so launches in
+    between still report an available update without any network I/O.
+    Callbacks go through `dispatch`, which hands them to the UI thread.
+    """
+
+    def __init__(self, current_version, dispatch, url=PYPI_URL, timeout=5):
+        self.current_version = current_version
+        self.dispatch = dispatch
+        self.url = url
+        self.timeout = timeout
+
+    def is_due(self):
+        """Return True if the last check is older than the interval."""
+        try:
+            interval = pvpn_config.get_int('USER', 'check_update_interval')
+        except (KeyError, ValueError):
+            interval = DEFAULT_CHECK_INTERVAL
+        try:
+            last_check = pvpn_config.get_int(
+                'metadata',
+                'last_gui_update_check',
+            )
+        except (KeyError, ValueError):
+            return True
+        return time() - last_check >= interval * 86400
+
+    def cached_version(self):
+        """Return the latest version found by a previous check, or None."""
+        try:
+            return pvpn_config.get('metadata', 'latest_gui_version')
+        except KeyError:
+            return None
+
+    def is_newer(self, version):
+        try:
+            return parse_version(version) > parse_version(self.current_version)
+        except (AttributeError, ValueError):
+            return False
+
+    def check(self, on_update, force=False):
+        """
+        Call on_update(latest_version) if a newer release is available.
+
+        Queries PyPI in a background thread only when a check is due (or
+        force is set); otherwise the cached result is used. Returns the
+        thread, if one was started.
+        """
+        if not force and not self.is_due():
+            pvpncli_logger.logger.debug("Update check not due; using cache")
+            cached = self.cached_version()
+            if self.is_newer(cached):
+                self.dispatch(on_update, cached)
+            return None
+        thread = threading.Thread(
+            target=self._run,
+            args=(on_update,),
+            name='UpdateChecker',
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def get_latest_version(self):
+        """Return the latest version from pypi, or None."""
+        pvpncli_logger.logger.debug("Calling pypi API")
+        try:
+            r = requests.get(self.url, timeout=self.timeout)
+            r.raise_for_status()
+            return r.json()["info"]["version"]
+        except requests.exceptions.RequestException as e:
+            pvpncli_logger.logger.debug(f"Couldn't check pypi API: {e}")
+        except (ValueError, KeyError, TypeError) as e:
+            pvpncli_logger.logger.debug(f"Bad response from pypi API: {e}")
+        return None
+
+    def _run(self, on_update):
+        latest_version = self.get_latest_version()
+        if latest_version is None:
+            # Try again next launch.
+            return
+        self.dispatch(self._save, latest_version)
+        if self.is_newer(latest_version):
+            pvpncli_logger.logger.debug(f"Update found: {latest_version}")
+            self.dispatch(on_update, latest_version)
+        else:
+            pvpncli_logger.logger.debug("No update")
+
+    def _save(self, latest_version):
+        """Record the check; runs on the UI thread with other config writes."""
+        try:
+            pvpncli_utils.set_config_value(
+                "metadata",
+                "last_gui_update_check",
+                int(time()),
+            )
+            pvpncli_utils.set_config_value(
+                "metadata",
+                "latest_gui_version",
+                latest_version,
+            )
+        # KeyError: no config file or metadata section yet (first run).
+        except (OSError, KeyError) as e:
+            print('Exception from UpdateChecker: ', e)
+        pvpn_config.invalidate()
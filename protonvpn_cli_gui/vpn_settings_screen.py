@@ -35,6 +35,8 @@ from protonvpn_cli import logger as pvpncli_logger
 from protonvpn_cli import utils as pvpncli_utils
 
 # Local
+from .config_cache import pvpn_config  # noqa # pylint: disable=import-error
+from .openvpn_management import add_management_directive  # noqa # pylint: disable=import-error
 from .widgets import (  # noqa # pylint: disable=import-error
     DefaultTextInput,
     PvpnPopup,
@@ -176,7 +178,7 @@ class VpnSettingsScreen(Screen):
         # Determine if profile has already been initialized
         try:
             self.is_initialized = (
-                int(pvpncli_utils.get_config_value("USER", "initialized"))
+                int(pvpn_config.get("USER", "initialized"))
             )
         except KeyError:
             self.is_initialized = None
@@ -274,6 +276,7 @@ class VpnSettingsScreen(Screen):
                 self.init_config_file()
                 # Create OpenVPN template.
                 pvpncli_utils.make_ovpn_template()
+                add_management_directive()
             # Set values to detect updates
             self.username_val = self.username.text
             self.passwd_val = self.password.text
@@ -311,30 +314,30 @@ class VpnSettingsScreen(Screen):
     def get_current_values(self):
         """Get current VPN Settings values from pvpn-cli.cfg."""
         # Username
-        self.username_val = pvpncli_utils.get_config_value("USER", "username")
+        self.username_val = pvpn_config.get("USER", "username")
         # Password
         cmd = f'/bin/cat {pvpncli_constants.PASSFILE}'
         user_passwd = subprocess.check_output(cmd, shell=True).decode()
         self.usr_val, self.passwd_val = user_passwd.split()
         # ProtonVPN Plan/Tier
-        self.tier_val = int(pvpncli_utils.get_config_value("USER", "tier"))
+        self.tier_val = int(pvpn_config.get("USER", "tier"))
         for opt, val in self.plan_options.items():
             if val == self.tier_val:
                 self.tier_val = opt
         # Default Protocol
-        self.prot_val = pvpncli_utils.get_config_value(
+        self.prot_val = pvpn_config.get(
             "USER",
             "default_protocol"
         )
         self.prot_val = self.prot_val.upper()
         # DNS Management
         # Check for custom_dns values.
-        self.dns_ip_val = pvpncli_utils.get_config_value(
+        self.dns_ip_val = pvpn_config.get(
             "USER",
             "custom_dns"
         )
         # Determine selection for dns_leak_protection
-        self.dns_val = int(pvpncli_utils.get_config_value(
+        self.dns_val = int(pvpn_config.get(
             "USER",
             "dns_leak_protection"
         ))
@@ -350,7 +353,7 @@ class VpnSettingsScreen(Screen):
             self.dns_val = 'Enable Leak Protection'
 
         # Kill Switch
-        self.kill_switch_val = int(pvpncli_utils.get_config_value(
+        self.kill_switch_val = int(pvpn_config.get(
             "USER",
             "killswitch"
         ))
@@ -358,7 +361,7 @@ class VpnSettingsScreen(Screen):
             if val == self.kill_switch_val:
                 self.kill_switch_val = opt
         # Split Tunneling
-        self.split_tunl_val = int(pvpncli_utils.get_config_value(
+        self.split_tunl_val = int(pvpn_config.get(
             "USER",
             "split_tunnel"
         ))
@@ -589,6 +592,7 @@ class VpnSettingsScreen(Screen):
 
         with open(pvpncli_constants.CONFIG_FILE, "w") as f:
             config.write(f)
+        pvpn_config.invalidate()
         pvpncli_utils.change_file_owner(pvpncli_constants.CONFIG_FILE)
         pvpncli_logger.logger.debug("pvpn-cli.cfg initialized")
 
@@ -600,6 +604,7 @@ class VpnSettingsScreen(Screen):
 
         with open(pvpncli_constants.CONFIG_FILE, "w+") as f:
             config.write(f)
+        pvpn_config.invalidate()
 
     def set_username_password(self):
         """Set the ProtonVPN Username and Password."""
@@ -626,6 +631,7 @@ class VpnSettingsScreen(Screen):
             os.remove(pvpncli_constants.SPLIT_TUNNEL_FILE)
         # Update OpenVPN template.
         pvpncli_utils.make_ovpn_template()
+        add_management_directive()
 
     def updates_made(self):
         """Compare current to initial values to determine if updates made."""
@@ -26,6 +26,9 @@ from kivy.uix.screenmanager import Screen  # , CardTransition, NoTransition
 # protonvpn-cli-ng Functions
 from protonvpn_cli import constants as pvpncli_constants
 
+# Local
+from .startup_trace import tracer
+
 
 class WelcomeScreen(Screen):
     """Intro screen. Check for profile & connect or request authentication."""
@@ -40,13 +43,15 @@ class WelcomeScreen(Screen):
         # Check for update:
         try:
             print("calling app.check_update")
-            app.check_update()
+            with tracer.phase('check_update'):
+                app.check_update()
         except KeyError:
             pass
         Clock.schedule_once(self.verify_login_credentials)
 
     def verify_login_credentials(self, dt):
         """Confirm required files for connecting exist, else initialize."""
+        tracer.begin('verify_login_credentials')
         app = App.get_running_app()
         # If the config directory doesn't exist, start initialization.
         if not os.path.isdir(pvpncli_constants.CONFIG_DIR):
@@ -80,3 +85,4 @@ class WelcomeScreen(Screen):
                     Clock.schedule_once(app.root.initialize_vpn_settings, 3) # noqa
             except Exception as e:
                 print('Exception from verify_login_credentials: ', e)
+        tracer.end('verify_login_credentials')
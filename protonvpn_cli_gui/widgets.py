@@ -22,6 +22,7 @@ from kivy.core.window import Window
 from kivy.properties import (  # noqa # pylint: disable=no-name-in-module
     AliasProperty,
     BooleanProperty,
+    ListProperty,
     NumericProperty,
     ObjectProperty,
     OptionProperty,
@@ -35,11 +36,13 @@ from kivy.uix.gridlayout import GridLayout
 from kivy.uix.image import Image
 from kivy.uix.label import Label
 from kivy.uix.popup import Popup
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.spinner import Spinner
 from kivy.uix.spinner import SpinnerOption
 from kivy.uix.textinput import TextInput
-from kivy.uix.treeview import TreeView, TreeViewNode
+from kivy.uix.widget import Widget
 
 # Local
 from .custombehaviors import ButtonBehavior, GrabBehavior, HoverBehavior  # noqa # pylint: disable=import-error
@@ -265,41 +268,119 @@ class PvpnGridLayout(GridLayout):
         self.bind(minimum_height=self.setter('height'))
 
 
-class PvpnTreeView(TreeView):
-    """Custom TreeView class for listing Countries and their servers."""
+class PvpnServerList(RecycleView):
+    """
+    Virtualized list of countries and their servers.
+
+    Only the rows in view have widgets; the rest is kept as plain data
+    dicts. Countries expand/collapse on press, with one country open at a
+    time. Server rows only exist for the open country: they come from
+    `load_servers(country)` when it opens and are dropped when it closes.
+    """
 
     def __init__(self, **kwargs):
-        super().__init__()
-        self.root_options = kwargs['root_options']
-        self.hide_root = kwargs['hide_root']
+        super().__init__(**kwargs)
+        # Country row dicts, in display order.
+        self.country_rows = []
+        self.load_servers = None
+        self.open_country = None
+
+    def set_rows(self, country_rows, load_servers):
+        """Replace the list's rows and redraw the visible ones."""
+        self.country_rows = country_rows
+        self.load_servers = load_servers
+        countries = set(row['country_name'] for row in country_rows)
+        if self.open_country not in countries:
+            self.open_country = None
+        self.update_data()
+
+    def toggle_country(self, country):
+        """Open country, closing any other open country, or close it."""
+        if self.open_country == country:
+            self.open_country = None
+        else:
+            self.open_country = country
+        self.update_data()
+
+    def update_data(self):
+        """Flatten country rows, and the open country's servers, to data."""
+        data = []
+        for row in self.country_rows:
+            row['is_open'] = row['country_name'] == self.open_country
+            data.append(row)
+            if row['is_open']:
+                data.extend(self.load_servers(self.open_country))
+        self.data = data
+
+
+class PvpnServerListCountryRow(RecycleDataViewBehavior, GrabBehavior,
+                               ButtonBehavior, BoxLayout):
+    """Clickable server list row for displaying available countries."""
+
+    country_name = StringProperty('')
+    server_summary = StringProperty('')
+    flag_source = StringProperty('')
+    feature_icon_1 = StringProperty('')
+    feature_icon_2 = StringProperty('')
+    is_open = BooleanProperty(False)
 
+    def on_press(self):
+        """Expand or collapse this country's servers."""
+        server_list = self.parent.parent
+        server_list.toggle_country(self.country_name)
 
-# # TreeViewNode for listing Countries:
-class PvpnServerTreeCountryNode(GrabBehavior, ButtonBehavior,
-                                BoxLayout, TreeViewNode):
-    """Clickable server tree nodes for displaying available countries."""
 
-    def __init__(self, **kwargs):
-        super().__init__()
-        self.bind(is_selected=self.unselect_node)
-        self.bind(is_selected=self.close_unselected_nodes)
+class PvpnServerListServerRow(RecycleDataViewBehavior, BoxLayout):
+    """Server list row for displaying available servers."""
 
-    # def unselect_node(self, dt):
-    def unselect_node(self, *args):
-        """Deselect selected node upon closing."""
-        if self.is_selected and self.is_open:
-            self.parent.deselect_node()
+    server_name = StringProperty('')
+    server_load = StringProperty('')
+    server_city = StringProperty('')
+    tier_source = StringProperty('')
+    feature_source = StringProperty('')
 
-    def close_unselected_nodes(self, *args):
-        """Close open nodes when another node is opened."""
-        for node in self.parent.iterate_open_nodes():
-            if node.is_open and node is not self and not node.is_selected:
-                self.parent.toggle_node(node)
 
+class PvpnSparkline(Widget):
+    """
+    Line graph of recent values, e.g., throughput history.
 
-class PvpnServerTreeServerNode(BoxLayout, TreeViewNode):
-    """Server tree nodes for displaying available servers."""
-    pass
+    Values are bucketed to one point per `step` pixels, keeping each
+    bucket's peak so short bursts stay visible, and scaled to the largest
+    value shown. Only the line's points change on redraw.
+    """
+
+    points = ListProperty([])
+    step = NumericProperty(2)
+    line_color = ListProperty([88/255, 179/255, 103/255, 1])
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.values = ()
+        self.bind(pos=self.redraw, size=self.redraw)
+
+    def set_values(self, values):
+        """Graph values (a sequence of numbers), oldest first."""
+        self.values = values
+        self.redraw()
+
+    def redraw(self, *args):
+        values = self.values
+        count = min(len(values), max(2, int(self.width // self.step)))
+        if count < 2:
+            self.points = []
+            return
+        peaks = []
+        for i in range(count):
+            start = i * len(values) // count
+            end = max(start + 1, (i + 1) * len(values) // count)
+            peaks.append(max(values[start:end]))
+        top = max(peaks) or 1
+        x_step = self.width / (count - 1)
+        points = []
+        for i, peak in enumerate(peaks):
+            points.append(self.x + i * x_step)
+            points.append(self.y + peak / top * self.height)
+        self.points = points
 
 
 class PvpnDropDown(DropDown):
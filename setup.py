@@ -10,6 +10,7 @@ import sys
 from shutil import rmtree
 
 from setuptools import find_packages, setup, Command
+from setuptools.command.build_py import build_py
 
 from protonvpn_cli_gui.protonvpnguiapp import VERSION as pvpngui_version
 
@@ -89,6 +90,36 @@ class UploadCommand(Command):
         sys.exit()
 
 
+class BuildAtlasCommand(Command):
+    """Support setup.py build_atlas."""
+
+    description = 'Pack flag and icon images into Kivy atlases.'
+    user_options = []
+
+    def initialize_options(self):
+        pass
+
+    def finalize_options(self):
+        pass
+
+    def run(self):
+        from protonvpn_cli_gui.assets import build_atlases
+        build_atlases()
+
+
+class BuildPyCommand(build_py):
+    """Pack the atlases before the package is built, so they're installed."""
+
+    def run(self):
+        try:
+            self.run_command('build_atlas')
+        except ImportError as e:
+            # Kivy's atlas packer needs Pillow; images load from their own
+            # files without atlases.
+            self.warn(f'atlases not built: {e}')
+        super().run()
+
+
 # Where the magic happens:
 setup(
     name=NAME,
@@ -111,6 +142,8 @@ setup(
     install_requires=REQUIRED,
     extras_require=EXTRAS,
     include_package_data=True,
+    # Built by build_atlas, so not listed in MANIFEST.in's source files.
+    package_data={'protonvpn_cli_gui': ['images/atlas/*']},
     license=LICENSE,
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -130,5 +163,7 @@ setup(
     # $ setup.py publish support.
     cmdclass={
         'upload': UploadCommand,
+        'build_atlas': BuildAtlasCommand,
+        'build_py': BuildPyCommand,
     },
 )
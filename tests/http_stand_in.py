@@ -0,0 +1,104 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Local HTTP server standing in for the ProtonVPN API in tests.
+
+# Standard Libraries
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+from socketserver import ThreadingMixIn
+import threading
+from time import sleep
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class ApiStandIn(object):
+    """
+    Answer GET requests on 127.0.0.1 with scripted responses.
+
+    respond(path, ...) queues a response for path; each request takes the
+    next one, and the last is repeated. Requests are recorded as (path,
+    headers) in `requests`.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stand_in._handle(self)
+
+        self.server = _Server(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        self._thread = threading.Thread(
+            target=self.server.serve_forever,
+            args=(0.05,),
+            daemon=True,
+        )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def respond(self, path, status=200, body=None, headers=None, delay=0):
+        """Queue a response; body is sent as JSON unless it's bytes."""
+        if body is not None and not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        with self._lock:
+            self.routes.setdefault(path, []).append(
+                (status, body or b'', headers or {}, delay)
+            )
+
+    def request_count(self, path):
+        with self._lock:
+            return sum(1 for request in self.requests if request[0] == path)
+
+    def _handle(self, handler):
+        with self._lock:
+            self.requests.append((handler.path, dict(handler.headers)))
+            responses = self.routes.get(handler.path)
+            if not responses:
+                response = (404, b'', {}, 0)
+            elif len(responses) > 1:
+                response = responses.pop(0)
+            else:
+                response = responses[0]
+        status, body, headers, delay = response
+        sleep(delay)
+        try:
+            handler.send_response(status)
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            handler.send_header('Content-Length', str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+        except OSError:
+            # The client gave up, e.g., after its timeout.
+            pass
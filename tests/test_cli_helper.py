@@ -0,0 +1,145 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Tests for running CLI commands on the CLI helper, with a fake pvpn-cli
+# package put first on the helper's path.
+
+# Standard Libraries
+import os
+import queue
+import shutil
+import tempfile
+import unittest
+from time import monotonic, sleep
+from unittest import mock
+
+# Local
+from protonvpn_cli_gui.cli_helper import CliHelper
+from protonvpn_cli_gui.command_runner import CommandRunner
+
+TIMEOUT = 10
+FAKE_CLI = '''
+import subprocess
+import sys
+import time
+
+
+def main():
+    command = sys.argv[1:]
+    if command[0] == 'c':
+        print('Connecting to', command[1])
+        print('Connected!')
+    elif command[0] == 'fail':
+        print('Not connected')
+        sys.exit(3)
+    elif command[0] == 'slow':
+        # Stands in for the openvpn process a connect starts.
+        child = subprocess.Popen(['sleep', '30'])
+        print(child.pid, flush=True)
+        time.sleep(30)
+'''
+
+
+def process_gone(pid):
+    """Determine if pid exited (a zombie counts as exited)."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().rsplit(')', 1)[1].split()[0] == 'Z'
+    except OSError:
+        return True
+
+
+class CliHelperTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cli_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cli_dir)
+        package = os.path.join(self.cli_dir, 'protonvpn_cli')
+        os.mkdir(package)
+        open(os.path.join(package, '__init__.py'), 'w').close()
+        with open(os.path.join(package, 'cli.py'), 'w') as f:
+            f.write(FAKE_CLI)
+        # The helper inherits the environment, so it imports the fake CLI.
+        environ = mock.patch.dict(os.environ, {'PYTHONPATH': self.cli_dir})
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.helper = CliHelper()
+        self.helper.start()
+        self.addCleanup(self.helper.stop)
+        self.output = queue.Queue()
+        self.completed = queue.Queue()
+        self.runner = CommandRunner(lambda callback, *args: callback(*args),
+                                    helper=self.helper)
+
+    def run_cmd(self, cmd):
+        job = self.runner.run(cmd, self.output.put, self.completed.put)
+        self.assertIs(self.completed.get(timeout=TIMEOUT), job)
+        return job
+
+    def test_command_runs_on_helper(self):
+        job = self.run_cmd('protonvpn c CH#1')
+        self.assertTrue(job.succeeded)
+        self.assertEqual(job.output, ['Connecting to CH#1', 'Connected!'])
+        self.assertIsNotNone(job.process.elapsed)
+        # Later commands reuse the running helper.
+        process = self.helper.process
+        self.assertTrue(self.run_cmd('protonvpn c SE#1').succeeded)
+        self.assertIs(self.helper.process, process)
+
+    def test_exit_code(self):
+        job = self.run_cmd('protonvpn fail')
+        self.assertEqual(job.returncode, 3)
+        self.assertEqual(job.output, ['Not connected'])
+
+    def test_other_commands_run_directly(self):
+        job = self.run_cmd('echo not-cli')
+        self.assertTrue(job.succeeded)
+        self.assertEqual(job.output, ['not-cli'])
+        self.assertFalse(hasattr(job.process, 'elapsed'))
+
+    def test_cancel_terminates_process_group(self):
+        job = self.runner.run('protonvpn slow', self.output.put)
+        child_pid = int(self.output.get(timeout=TIMEOUT))
+        self.runner.cancel()
+        deadline = monotonic() + TIMEOUT
+        while self.runner.current_job is not None:
+            self.assertLess(monotonic(), deadline)
+            sleep(0.05)
+        self.assertTrue(job.cancelled)
+        self.assertTrue(self.completed.empty())
+        while not process_gone(child_pid):
+            self.assertLess(monotonic(), deadline)
+            sleep(0.05)
+
+    def test_helper_restarted_after_exit(self):
+        self.run_cmd('protonvpn c CH#1')
+        self.helper.process.kill()
+        self.helper.process.wait()
+        job = self.run_cmd('protonvpn c CH#2')
+        self.assertTrue(job.succeeded)
+        self.assertIsNotNone(job.process.elapsed)
+
+    def test_stop_removes_socket_dir(self):
+        self.run_cmd('protonvpn c CH#1')
+        socket_dir = self.helper.socket_dir
+        self.helper.stop()
+        self.assertFalse(os.path.exists(socket_dir))
+        self.assertFalse(self.helper.running)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Tests for the OpenVPN process watcher, with a long-running dummy process
+# standing in for openvpn.
+
+# Standard Libraries
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import unittest
+from time import sleep, time
+
+# Local
+from protonvpn_cli_gui.connection_watcher import (
+    OpenVpnWatcher,
+    find_process,
+    process_alive,
+    process_start_time,
+)
+
+# The watcher matches /proc/<pid>/comm, which is the name the dummy is
+# started as (at most 15 characters).
+DUMMY_NAME = 'pvpngui-fakevpn'
+# Seconds to wait for the watcher to report a change.
+TIMEOUT = 3
+
+
+class OpenVpnWatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        sleep = shutil.which('sleep')
+        if sleep is None:
+            self.skipTest('sleep is not available')
+        self.tmp_dir = tempfile.mkdtemp()
+        self.dummy = os.path.join(self.tmp_dir, DUMMY_NAME)
+        os.symlink(sleep, self.dummy)
+        self.changes = queue.Queue()
+        self.processes = []
+        self.watcher = None
+
+    def tearDown(self):
+        if self.watcher:
+            self.watcher.stop()
+        for process in self.processes:
+            process.kill()
+            process.wait()
+        shutil.rmtree(self.tmp_dir)
+
+    def start_dummy(self):
+        process = subprocess.Popen([self.dummy, '60'])
+        self.processes.append(process)
+        # Popen can return before the child has exec'd the dummy.
+        deadline = time() + TIMEOUT
+        while not process_alive(process.pid, DUMMY_NAME):
+            self.assertLess(time(), deadline)
+            sleep(0.01)
+        return process
+
+    def start_watcher(self, on_change=None, **kwargs):
+        kwargs.setdefault('scan_interval', 0.1)
+        self.watcher = OpenVpnWatcher(
+            on_change or self.changes.put,
+            process_name=DUMMY_NAME,
+            **kwargs
+        )
+        self.watcher.start()
+        return self.watcher
+
+    def test_find_process(self):
+        self.assertIsNone(find_process(DUMMY_NAME))
+        process = self.start_dummy()
+        self.assertEqual(find_process(DUMMY_NAME), process.pid)
+
+    def test_running_process_found_on_start(self):
+        process = self.start_dummy()
+        watcher = self.start_watcher()
+        self.assertTrue(watcher.connected)
+        self.assertEqual(watcher.pid, process.pid)
+
+    def test_reports_start_and_exit(self):
+        watcher = self.start_watcher()
+        self.assertFalse(watcher.connected)
+        process = self.start_dummy()
+        watcher.rescan()
+        self.assertIs(self.changes.get(timeout=TIMEOUT), True)
+        self.assertEqual(watcher.pid, process.pid)
+        self.assertLess(abs(watcher.started_at - time()), 2)
+        process.kill()
+        process.wait()
+        self.assertIs(self.changes.get(timeout=TIMEOUT), False)
+        self.assertIsNone(watcher.pid)
+        self.assertIsNone(watcher.started_at)
+
+    def test_replaced_process_is_reported(self):
+        first = self.start_dummy()
+        watcher = self.start_watcher()
+        second = self.start_dummy()
+        first.kill()
+        first.wait()
+        self.assertIs(self.changes.get(timeout=TIMEOUT), True)
+        self.assertEqual(watcher.pid, second.pid)
+
+    def test_failing_callback_keeps_watching(self):
+        def on_change(connected):
+            self.changes.put(connected)
+            if connected:
+                raise RuntimeError('callback failed')
+
+        watcher = self.start_watcher(on_change)
+        process = self.start_dummy()
+        watcher.rescan()
+        self.assertIs(self.changes.get(timeout=TIMEOUT), True)
+        process.kill()
+        process.wait()
+        self.assertIs(self.changes.get(timeout=TIMEOUT), False)
+
+    def test_no_rescan_without_events(self):
+        watch_dir = os.path.join(self.tmp_dir, 'config')
+        os.mkdir(watch_dir)
+        watcher = self.start_watcher(scan_interval=60, watch_dir=watch_dir)
+        # Past the thread's first scan.
+        sleep(0.1)
+        process = self.start_dummy()
+        # Not found by polling...
+        with self.assertRaises(queue.Empty):
+            self.changes.get(timeout=0.3)
+        # ...but as soon as a file in the watched directory is written.
+        with open(os.path.join(watch_dir, 'pvpn-cli.cfg'), 'w') as f:
+            f.write('[metadata]\n')
+        self.assertIs(self.changes.get(timeout=TIMEOUT), True)
+        self.assertEqual(watcher.pid, process.pid)
+        process.kill()
+        process.wait()
+        self.assertIs(self.changes.get(timeout=TIMEOUT), False)
+        # Back to waiting on events; rescan() still works.
+        process = self.start_dummy()
+        watcher.rescan()
+        self.assertIs(self.changes.get(timeout=TIMEOUT), True)
+
+    def test_process_start_time(self):
+        process = self.start_dummy()
+        self.assertLess(abs(process_start_time(process.pid) - time()), 2)
+        self.assertIsNone(process_start_time(2 ** 22 + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Tests for the exit IP resolver, against a local HTTP stand-in for the API.
+
+# Standard Libraries
+import queue
+import unittest
+from time import sleep
+
+# Local
+from protonvpn_cli_gui.ip_resolver import LOCATION_ENDPOINT, ExitIpResolver
+from tests.http_stand_in import ApiStandIn
+
+TIMEOUT = 5
+LOCATION = {'Code': 1000, 'IP': '203.0.113.7', 'ISP': 'Test'}
+SERVER = 'CH#1'
+
+
+class ExitIpResolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.api = ApiStandIn().start()
+        self.addCleanup(self.api.stop)
+        self.results = queue.Queue()
+        self.resolver = ExitIpResolver(
+            lambda callback, *args: callback(*args),
+            timeout=0.3,
+            retries=3,
+            backoff=0.01,
+            api_domain=self.api.url,
+        )
+
+    def resolve(self, key=SERVER):
+        """Return the IP for key, waiting for the lookup if needed."""
+        ip = self.resolver.resolve(key, self.results.put)
+        if ip is None:
+            ip = self.results.get(timeout=TIMEOUT)
+        return ip
+
+    def lookups(self):
+        return self.api.request_count(LOCATION_ENDPOINT)
+
+    def test_lookup_is_cached_per_server(self):
+        self.api.respond(LOCATION_ENDPOINT, body=LOCATION)
+        self.assertEqual(self.resolve(), '203.0.113.7')
+        self.assertEqual(self.resolver.cached(SERVER), '203.0.113.7')
+        self.assertEqual(self.resolve(), '203.0.113.7')
+        # Reconnecting to the same server is answered from the cache.
+        self.assertEqual(self.resolve(SERVER), '203.0.113.7')
+        self.assertEqual(self.lookups(), 1)
+        # Another server, or no connection, is looked up.
+        self.assertIsNone(self.resolver.cached('SE#1'))
+        self.resolve('SE#1')
+        self.resolve(None)
+        self.assertEqual(self.lookups(), 3)
+
+    def test_expired_entry_is_looked_up_again(self):
+        self.api.respond(LOCATION_ENDPOINT, body=LOCATION)
+        self.resolver.ttl = 0
+        self.resolve()
+        self.resolve()
+        self.assertEqual(self.lookups(), 2)
+
+    def test_failures_are_retried_then_reported(self):
+        self.api.respond(LOCATION_ENDPOINT, status=500)
+        self.assertIsNone(self.resolve())
+        self.assertEqual(self.lookups(), 4)
+        self.assertIsNone(self.resolver.cached(SERVER))
+
+    def test_retry_succeeds(self):
+        self.api.respond(LOCATION_ENDPOINT, status=500)
+        self.api.respond(LOCATION_ENDPOINT, status=500)
+        self.api.respond(LOCATION_ENDPOINT, body=LOCATION)
+        self.assertEqual(self.resolve(), '203.0.113.7')
+        self.assertEqual(self.lookups(), 3)
+
+    def test_slow_api_times_out(self):
+        self.api.respond(LOCATION_ENDPOINT, body=LOCATION, delay=1)
+        self.resolver.retries = 0
+        self.assertIsNone(self.resolve())
+
+    def test_concurrent_lookups_are_shared(self):
+        self.api.respond(LOCATION_ENDPOINT, body=LOCATION, delay=0.1)
+        self.assertIsNone(self.resolver.resolve(SERVER, self.results.put))
+        self.assertIsNone(self.resolver.resolve(SERVER, self.results.put))
+        self.assertEqual(self.results.get(timeout=TIMEOUT), '203.0.113.7')
+        self.assertEqual(self.results.get(timeout=TIMEOUT), '203.0.113.7')
+        self.assertEqual(self.lookups(), 1)
+
+    def test_invalidate(self):
+        self.api.respond(LOCATION_ENDPOINT, body=LOCATION)
+        self.resolve()
+        self.resolver.invalidate(SERVER)
+        self.assertIsNone(self.resolver.cached(SERVER))
+        self.resolve()
+        self.assertEqual(self.lookups(), 2)
+
+    def test_lookup_invalidated_in_flight_is_dropped(self):
+        # E.g., a lookup made while disconnected, as the tunnel comes up.
+        self.api.respond(LOCATION_ENDPOINT, body=LOCATION, delay=0.1)
+        self.assertIsNone(self.resolver.resolve(None, self.results.put))
+        self.resolver.invalidate(None)
+        sleep(0.3)
+        self.assertTrue(self.results.empty())
+        self.assertIsNone(self.resolver.cached(None))
+        self.assertEqual(self.resolve(None), '203.0.113.7')
+
+
+if __name__ == '__main__':
+    unittest.main()
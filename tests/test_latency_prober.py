@@ -0,0 +1,160 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Tests for the latency prober, against local listener sockets with
+# injected delays.
+
+# Standard Libraries
+import queue
+import socket
+import unittest
+from time import monotonic, sleep
+
+# Local
+from protonvpn_cli_gui.latency_prober import LatencyProber, tcp_connect_time
+
+# Loopback addresses with a listener, and the delay injected for each.
+DELAYS = {
+    '127.0.0.1': 0.08,
+    '127.0.0.2': 0.02,
+    '127.0.0.3': 0.05,
+    '127.0.0.4': 0.03,
+}
+# Nothing listens here: refused right away.
+REFUSED_IP = '127.0.0.9'
+# Stands in for a host that never answers: probes run into the timeout.
+BLACK_HOLE_IP = '192.0.2.1'
+TIMEOUT = 5
+
+
+def server(name, ip, load, score):
+    return {'Name': name, 'EntryIP': ip, 'Load': load, 'Score': score}
+
+
+SERVERS = [
+    server('CH#1', '127.0.0.1', 5, 1.0),
+    server('CH#2', '127.0.0.2', 90, 1.2),
+    server('CH#3', '127.0.0.3', 10, 1.1),
+    server('CH#4', '127.0.0.4', 20, 3.0),
+    server('CH#5', REFUSED_IP, 0, 0.5),
+    server('CH#6', BLACK_HOLE_IP, 0, 0.6),
+    server('CH#7', None, 0, 0.1),
+]
+
+
+class DelayedProber(LatencyProber):
+    """Probe the local listeners, adding each one's injected delay."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.probed = []
+
+    def probe(self, ip):
+        self.probed.append(ip)
+        if ip == BLACK_HOLE_IP:
+            sleep(self.timeout)
+            return None
+        delay = DELAYS.get(ip, 0)
+        sleep(delay)
+        rtt = tcp_connect_time(ip, self.port, self.timeout)
+        return None if rtt is None else rtt + delay
+
+
+class LatencyProberTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.listeners = []
+        first = socket.socket()
+        first.bind(('127.0.0.1', 0))
+        cls.port = first.getsockname()[1]
+        cls.listeners.append(first)
+        for ip in list(DELAYS)[1:]:
+            listener = socket.socket()
+            try:
+                listener.bind((ip, cls.port))
+            except OSError:
+                listener.close()
+                cls.tearDownClass()
+                raise unittest.SkipTest(f'cannot listen on {ip}')
+            cls.listeners.append(listener)
+        for listener in cls.listeners:
+            listener.listen(64)
+
+    @classmethod
+    def tearDownClass(cls):
+        for listener in cls.listeners:
+            listener.close()
+
+    def prober(self, **kwargs):
+        kwargs.setdefault('timeout', 0.3)
+        return DelayedProber(
+            lambda callback, *args: callback(*args),
+            port=self.port,
+            **kwargs
+        )
+
+    def test_rank_by_rtt_and_load(self):
+        prober = self.prober()
+        # Costs: CH#4 0.03 * 1.2, CH#2 0.02 * 1.9, CH#3 0.05 * 1.1,
+        # CH#1 0.08 * 1.05; the others can't be reached.
+        self.assertEqual(
+            prober.rank(SERVERS),
+            ['CH#4', 'CH#2', 'CH#3', 'CH#1'],
+        )
+
+    def test_probes_run_concurrently(self):
+        started = monotonic()
+        self.prober(max_workers=8).rank(SERVERS)
+        # One at a time, the delays and the black hole take 0.48 s.
+        self.assertLess(monotonic() - started, 0.45)
+
+    def test_shortlist_by_score(self):
+        prober = self.prober(candidates=2)
+        self.assertEqual(prober.rank(SERVERS), [])
+        self.assertEqual(sorted(prober.probed), [REFUSED_IP, BLACK_HOLE_IP])
+        prober = self.prober(candidates=2)
+        self.assertEqual(prober.rank(SERVERS[:4]), ['CH#3', 'CH#1'])
+
+    def test_results_are_cached(self):
+        prober = self.prober()
+        prober.rank(SERVERS)
+        probes = len(prober.probed)
+        prober.rank(SERVERS)
+        self.assertEqual(len(prober.probed), probes)
+        prober.ttl = 0
+        prober.rank(SERVERS)
+        self.assertEqual(len(prober.probed), 2 * probes)
+
+    def test_failures_cached_only_if_something_answered(self):
+        prober = self.prober()
+        unreachable = [server('CH#5', REFUSED_IP, 0, 0.5)]
+        prober.rank(unreachable)
+        prober.rank(unreachable)
+        self.assertEqual(prober.probed, [REFUSED_IP, REFUSED_IP])
+
+    def test_fastest(self):
+        prober = self.prober()
+        results = queue.Queue()
+        prober.fastest(SERVERS, results.put)
+        self.assertEqual(results.get(timeout=TIMEOUT), 'CH#4')
+        prober.fastest(SERVERS[4:], results.put)
+        self.assertIsNone(results.get(timeout=TIMEOUT))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,227 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Tests for the OpenVPN management client, against a scripted stand-in for
+# OpenVPN's management socket.
+
+# Standard Libraries
+import os
+import queue
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import constants as pvpncli_constants
+
+# Local
+from protonvpn_cli_gui.openvpn_management import (
+    ManagementClient,
+    add_management_directive,
+    management_directive,
+    parse_state,
+    remove_management_directive,
+)
+
+TIMEOUT = 3
+# What OpenVPN lists for `state on all`, ending with END.
+HISTORY = [
+    '1700000000,CONNECTING,,,,,,',
+    '1700000001,CONNECTED,SUCCESS,10.8.0.2,185.1.1.1,1194,,',
+    'END',
+    'SUCCESS: real-time state notification set to ON',
+    'SUCCESS: bytecount interval changed',
+]
+
+
+class FakeManagement(object):
+    """
+    Accept one client on a Unix socket, record what it sends, then send
+    the scripted lines and close, like OpenVPN exiting.
+    """
+
+    def __init__(self, path, lines):
+        self.lines = lines
+        self.received = b''
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(1)
+        self.server.settimeout(TIMEOUT)
+        self.proceed = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            conn, _ = self.server.accept()
+        except socket.timeout:
+            return
+        finally:
+            self.server.close()
+        with conn:
+            conn.sendall(b">INFO:OpenVPN Management Interface Version 3\r\n")
+            while self.received.count(b'\n') < 2:
+                data = conn.recv(1024)
+                if not data:
+                    return
+                self.received += data
+            for line in self.lines:
+                if line is None:
+                    # Pause until the test lets the script go on.
+                    self.proceed.wait(TIMEOUT)
+                    continue
+                conn.sendall(line.encode() + b'\r\n')
+
+    def join(self):
+        self._thread.join(TIMEOUT)
+
+
+class ManagementClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, 'management.sock')
+        self.events = queue.Queue()
+        self.client = ManagementClient(
+            lambda state: self.events.put(('state', state)),
+            lambda rx, tx: self.events.put(('bytecount', rx, tx)),
+            path=self.path,
+            bytecount_interval=2,
+            connect_attempts=5,
+            retry_delay=0.05,
+        )
+        self.addCleanup(self.client.stop)
+
+    def next_event(self):
+        return self.events.get(timeout=TIMEOUT)
+
+    def next_state(self):
+        event = self.next_event()
+        self.assertEqual(event[0], 'state')
+        return event[1] and event[1].name
+
+    def test_follows_state_and_byte_counts(self):
+        fake = FakeManagement(self.path, HISTORY + [
+            '>BYTECOUNT:1000,200',
+            '>INFO:ignored',
+            '>STATE:1700000005,RECONNECTING,ping-restart,,,,,',
+            '>STATE:1700000006,CONNECTED,SUCCESS,10.8.0.3,185.1.1.2,1194,,',
+            '>BYTECOUNT:5000,900',
+            '>STATE:1700000009,EXITING,SIGTERM,,,,,',
+        ])
+        self.client.start()
+        # The current state comes first, from the history.
+        self.assertEqual(self.next_state(), 'CONNECTED')
+        self.assertEqual(self.next_event(), ('bytecount', 1000, 200))
+        self.assertEqual(self.next_state(), 'RECONNECTING')
+        self.assertEqual(self.next_state(), 'CONNECTED')
+        self.assertEqual(self.next_event(), ('bytecount', 5000, 900))
+        self.assertEqual(self.next_state(), 'EXITING')
+        # EOF: OpenVPN exited.
+        self.assertIsNone(self.next_state())
+        fake.join()
+        self.assertEqual(fake.received, b'state on all\nbytecount 2\n')
+        self.assertFalse(self.client.connected)
+
+    def test_connected_while_attached(self):
+        fake = FakeManagement(self.path, HISTORY + [None])
+        self.client.start()
+        self.assertEqual(self.next_state(), 'CONNECTED')
+        self.assertTrue(self.client.connected)
+        fake.proceed.set()
+        self.assertIsNone(self.next_state())
+        self.assertFalse(self.client.connected)
+
+    def test_retries_until_socket_opens(self):
+        self.client.start()
+        threading.Timer(
+            0.1,
+            FakeManagement,
+            (self.path, HISTORY),
+        ).start()
+        self.assertEqual(self.next_state(), 'CONNECTED')
+
+    def test_sleeps_until_woken(self):
+        self.client.start()
+        # Nothing listening: the client gives up until woken.
+        with self.assertRaises(queue.Empty):
+            self.events.get(timeout=0.5)
+        FakeManagement(self.path, HISTORY)
+        with self.assertRaises(queue.Empty):
+            self.events.get(timeout=0.3)
+        self.client.wake()
+        self.assertEqual(self.next_state(), 'CONNECTED')
+
+
+class ManagementDirectiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.template = os.path.join(self.tmp_dir, 'template.ovpn')
+        self.path = os.path.join(self.tmp_dir, 'management.sock')
+
+    def read_template(self):
+        with open(self.template) as f:
+            return f.read().splitlines()
+
+    def test_directive_added_and_removed(self):
+        with open(self.template, 'w') as f:
+            f.write('client\ndev tun\n')
+        self.assertTrue(add_management_directive(self.template, self.path))
+        self.assertTrue(add_management_directive(self.template, self.path))
+        self.assertEqual(
+            self.read_template(),
+            ['client', 'dev tun', management_directive(self.path)],
+        )
+        remove_management_directive(self.template, self.path)
+        self.assertEqual(self.read_template(), ['client', 'dev tun'])
+
+    def test_existing_directive_left_alone(self):
+        with open(self.template, 'w') as f:
+            f.write('client\nmanagement /old/path unix\n')
+        self.assertFalse(add_management_directive(self.template, self.path))
+        remove_management_directive(self.template, self.path)
+        self.assertEqual(
+            self.read_template(),
+            ['client', 'management /old/path unix'],
+        )
+
+    def test_cli_without_template(self):
+        with mock.patch.object(pvpncli_constants, 'TEMPLATE_FILE', None,
+                               create=True):
+            self.assertFalse(add_management_directive(path=self.path))
+            remove_management_directive(path=self.path)
+
+    def test_missing_template(self):
+        self.assertFalse(add_management_directive(self.template, self.path))
+
+    def test_parse_state(self):
+        state = parse_state('1700000001,CONNECTED,SUCCESS,10.8.0.2,1.2.3.4')
+        self.assertEqual(state.timestamp, 1700000001)
+        self.assertEqual(state.name, 'CONNECTED')
+        self.assertEqual(state.remote_ip, '1.2.3.4')
+        self.assertEqual(state.remote_port, '')
+        self.assertIsNone(parse_state('garbage'))
+
+
+if __name__ == '__main__':
+    unittest.main()
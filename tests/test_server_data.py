@@ -0,0 +1,272 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Tests for the server list client and the background server data worker,
+# against a local HTTP stand-in for the API.
+
+# Standard Libraries
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import constants as pvpncli_constants
+
+# Local
+from protonvpn_cli_gui import server_data
+from protonvpn_cli_gui.api_client import LOGICALS_ENDPOINT, ServerListClient
+from protonvpn_cli_gui.server_data import ServerDataWorker
+from tests.http_stand_in import ApiStandIn
+
+TIMEOUT = 5
+
+
+def logical(name, country, tier=1, features=0, status=1):
+    return {
+        'Name': name,
+        'EntryCountry': country,
+        'ExitCountry': country,
+        'Tier': tier,
+        'Features': features,
+        'Load': 10,
+        'Score': 1.0,
+        'Status': status,
+        'Servers': [{'EntryIP': '127.0.0.1'}],
+    }
+
+
+SERVERS = {
+    'Code': 1000,
+    'LogicalServers': [
+        logical('CH#1', 'CH'),
+        logical('CH#2', 'CH', status=0),
+        logical('SE#1', 'SE', tier=2),
+    ],
+}
+
+VALIDATORS = {
+    'ETag': 'W/"servers-1"',
+    'Last-Modified': 'Sat, 17 Oct 2026 10:00:00 GMT',
+}
+
+
+class ServerDataTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.api = ApiStandIn().start()
+        self.addCleanup(self.api.stop)
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        server_info_file = os.path.join(self.tmp_dir, 'serverinfo.json')
+        patcher = mock.patch.object(
+            pvpncli_constants,
+            'SERVER_INFO_FILE',
+            server_info_file,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Config writes are handed off, and never run here.
+        self.config_writes = []
+        self.client = self.new_client()
+
+    def new_client(self):
+        return ServerListClient(
+            api_domain=self.api.url,
+            timeout=0.5,
+            dispatch=lambda callback, *args: self.config_writes.append(args),
+        )
+
+
+class ServerListClientTest(ServerDataTestCase):
+
+    def setUp(self):
+        super().setUp()
+        snapshot_file = os.path.join(self.tmp_dir, 'servers.snapshot')
+        for patcher in (
+            mock.patch.object(server_data, 'SNAPSHOT_FILE', snapshot_file),
+            mock.patch.object(server_data, 'server_list_client', self.client),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def sent_headers(self):
+        return [headers for path, headers in self.api.requests]
+
+    def test_not_modified_reuses_catalog(self):
+        self.api.respond(LOGICALS_ENDPOINT, body=SERVERS, headers=VALIDATORS)
+        self.api.respond(LOGICALS_ENDPOINT, status=304, headers=VALIDATORS)
+        first, changed = self.client.fetch()
+        self.assertTrue(changed)
+        server_info = os.stat(pvpncli_constants.SERVER_INFO_FILE)
+        bytes_received = self.client.bytes_received
+
+        second, changed = self.client.fetch()
+        self.assertFalse(changed)
+        self.assertNotIn('If-None-Match', self.sent_headers()[0])
+        self.assertEqual(
+            self.sent_headers()[1]['If-None-Match'],
+            VALIDATORS['ETag'],
+        )
+        self.assertEqual(
+            self.sent_headers()[1]['If-Modified-Since'],
+            VALIDATORS['Last-Modified'],
+        )
+        # Same data in a new catalog; the first one isn't touched.
+        self.assertIsNot(second, first)
+        self.assertIs(second.columns, first.columns)
+        self.assertGreaterEqual(second.pulled_at, first.pulled_at)
+        self.assertEqual(second.value('SE#1', 'Tier'), 2)
+        # Nothing downloaded, and the CLI's copy is left alone.
+        self.assertEqual(self.client.bytes_received, bytes_received)
+        self.assertEqual(self.client.not_modified, 1)
+        self.assertEqual(
+            os.stat(pvpncli_constants.SERVER_INFO_FILE).st_mtime_ns,
+            server_info.st_mtime_ns,
+        )
+
+    def test_snapshot_saved_after_not_modified(self):
+        self.api.respond(LOGICALS_ENDPOINT, body=SERVERS, headers=VALIDATORS)
+        self.api.respond(LOGICALS_ENDPOINT, status=304, headers=VALIDATORS)
+        first = server_data.pull_server_catalog()
+        catalog = server_data.pull_server_catalog()
+        saved = server_data.load_snapshot()
+        self.assertNotEqual(catalog.pulled_at, first.pulled_at)
+        self.assertEqual(saved.pulled_at, catalog.pulled_at)
+        self.assertEqual(len(saved), 2)
+
+    def test_snapshot_owned_by_user(self):
+        self.api.respond(LOGICALS_ENDPOINT, body=SERVERS)
+        with mock.patch.object(
+            server_data.pvpncli_utils,
+            'change_file_owner',
+        ) as change_file_owner:
+            server_data.pull_server_catalog()
+        change_file_owner.assert_any_call(server_data.SNAPSHOT_FILE)
+
+    def test_validators_survive_restart(self):
+        self.api.respond(LOGICALS_ENDPOINT, body=SERVERS, headers=VALIDATORS)
+        self.api.respond(LOGICALS_ENDPOINT, status=304, headers=VALIDATORS)
+        server_data.pull_server_catalog()
+
+        # A new launch starts from the snapshot and its validators.
+        client = self.new_client()
+        with mock.patch.object(server_data, 'server_list_client', client):
+            cached = server_data.cached_server_catalog()
+            self.assertEqual(len(cached), 2)
+            catalog, changed = client.fetch()
+        self.assertFalse(changed)
+        self.assertEqual(catalog.value('SE#1', 'Tier'), 2)
+        self.assertEqual(
+            self.sent_headers()[1]['If-None-Match'],
+            VALIDATORS['ETag'],
+        )
+        # One full download across both launches.
+        self.assertEqual(client.bytes_received, 0)
+
+    def test_full_download_without_server_info_file(self):
+        self.api.respond(LOGICALS_ENDPOINT, body=SERVERS, headers=VALIDATORS)
+        server_data.pull_server_catalog()
+        os.remove(pvpncli_constants.SERVER_INFO_FILE)
+        client = self.new_client()
+        with mock.patch.object(server_data, 'server_list_client', client):
+            server_data.cached_server_catalog()
+            self.assertTrue(client.fetch()[1])
+        self.assertNotIn('If-None-Match', self.sent_headers()[1])
+        self.assertTrue(os.path.isfile(pvpncli_constants.SERVER_INFO_FILE))
+
+
+class ServerDataWorkerTest(ServerDataTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Stands in for the UI thread.
+        self.ui_calls = queue.Queue()
+        self.worker = ServerDataWorker(
+            lambda callback, *args: self.ui_calls.put((callback, args)),
+            fetch=lambda: self.client.fetch()[0],
+        )
+
+    def run_ui_call(self):
+        """Run the next callback handed to the UI thread."""
+        callback, args = self.ui_calls.get(timeout=TIMEOUT)
+        callback(*args)
+
+    def test_result_applied_on_ui_thread(self):
+        self.api.respond(LOGICALS_ENDPOINT, body=SERVERS)
+        results = []
+        threads = []
+
+        def on_ready(catalog):
+            results.append(catalog)
+            threads.append(threading.current_thread())
+
+        self.worker.refresh(on_ready)
+        self.run_ui_call()
+        self.assertEqual(threads, [threading.current_thread()])
+        catalog = results[0]
+        # Offline servers are dropped.
+        self.assertEqual(len(catalog), 2)
+        self.assertIsNone(catalog.get('CH#2'))
+        self.assertEqual(catalog.value('SE#1', 'Tier'), 2)
+        self.assertTrue(os.path.isfile(pvpncli_constants.SERVER_INFO_FILE))
+        self.assertEqual(len(self.config_writes), 1)
+        self.assertFalse(self.worker.busy)
+
+    def test_refreshes_in_flight_share_one_pull(self):
+        self.api.respond(LOGICALS_ENDPOINT, body=SERVERS, delay=0.2)
+        results = []
+        self.worker.refresh(results.append)
+        self.worker.refresh(results.append)
+        self.assertTrue(self.worker.busy)
+        self.run_ui_call()
+        self.run_ui_call()
+        self.assertEqual(self.api.request_count(LOGICALS_ENDPOINT), 1)
+        self.assertIs(results[0], results[1])
+
+    def test_failed_pull_reports_error(self):
+        self.api.respond(LOGICALS_ENDPOINT, status=500)
+        errors = []
+        self.worker.refresh(self.fail, errors.append)
+        self.run_ui_call()
+        self.assertEqual(len(errors), 1)
+        self.assertFalse(self.worker.busy)
+
+    def test_api_error_code_reports_error(self):
+        self.api.respond(
+            LOGICALS_ENDPOINT,
+            body={'Code': 2001, 'Error': 'Invalid access token'},
+        )
+        errors = []
+        self.worker.refresh(self.fail, errors.append)
+        self.run_ui_call()
+        self.assertIsInstance(errors[0], ValueError)
+        self.assertFalse(os.path.exists(pvpncli_constants.SERVER_INFO_FILE))
+
+    def test_slow_api_times_out(self):
+        self.api.respond(LOGICALS_ENDPOINT, body=SERVERS, delay=1)
+        errors = []
+        self.worker.refresh(self.fail, errors.append)
+        self.run_ui_call()
+        self.assertEqual(len(errors), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
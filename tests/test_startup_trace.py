@@ -0,0 +1,114 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Tests for the startup tracer.
+
+# Standard Libraries
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+
+# Local
+from protonvpn_cli_gui.startup_trace import (
+    FIRST_FRAME,
+    INTERACTIVE,
+    StartupTracer,
+)
+
+
+class StartupTracerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.tracer = StartupTracer(enabled=True, output_dir=self.tmp_dir)
+
+    def run_in_thread(self, target):
+        thread = threading.Thread(target=target, name='worker')
+        thread.start()
+        thread.join()
+
+    def phase_threads(self, name):
+        return sorted(
+            thread for phase, _, _, thread in self.tracer.phases
+            if phase == name
+        )
+
+    def test_same_phase_on_two_threads(self):
+        started = threading.Event()
+        proceed = threading.Event()
+
+        def lookup():
+            with self.tracer.phase('get_ip_info'):
+                started.set()
+                proceed.wait(5)
+
+        thread = threading.Thread(target=lookup, name='worker')
+        thread.start()
+        started.wait(5)
+        # Overlaps the worker's phase; neither ends the other.
+        with self.tracer.phase('get_ip_info'):
+            proceed.set()
+            thread.join()
+        self.assertEqual(
+            self.phase_threads('get_ip_info'),
+            sorted(['worker', threading.current_thread().name]),
+        )
+
+    def test_end_on_another_thread_is_ignored(self):
+        self.tracer.begin('refresh')
+        self.run_in_thread(lambda: self.tracer.end('refresh'))
+        self.assertEqual(self.phase_threads('refresh'), [])
+        self.tracer.end('refresh')
+        self.assertEqual(len(self.phase_threads('refresh')), 1)
+
+    def test_finish_reports_open_phases_and_startup_times(self):
+        self.run_in_thread(lambda: self.tracer.begin('pull'))
+        self.tracer.mark(FIRST_FRAME)
+        self.tracer.mark(INTERACTIVE)
+        json_path, trace_path = self.tracer.finish()
+        with open(json_path) as f:
+            report = json.load(f)
+        self.assertEqual(
+            [phase['thread'] for phase in report['phases']],
+            ['worker'],
+        )
+        self.assertIsNotNone(report['first_frame_ms'])
+        self.assertGreaterEqual(
+            report['interactive_ms'],
+            report['first_frame_ms'],
+        )
+        if report['process_age_at_start_ms'] is not None:
+            self.assertGreaterEqual(
+                report['interactive_since_process_start_ms'],
+                report['interactive_ms'],
+            )
+        with open(trace_path) as f:
+            self.assertIn('traceEvents', json.load(f))
+
+    def test_disabled(self):
+        tracer = StartupTracer()
+        with tracer.phase('imports'):
+            tracer.mark(FIRST_FRAME)
+        self.assertIsNone(tracer.finish())
+        self.assertEqual(tracer.phases, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+#    This file is part of ProtonVPN-CLI-GUI for Linux.
+
+#    Copyright (C) <year>  <name of author>
+#
+#    ProtonVPN-CLI-GUI is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Tests for the update checker, against a local HTTP stand-in for PyPI.
+
+# Standard Libraries
+from configparser import ConfigParser
+import os
+import shutil
+import tempfile
+import unittest
+from time import time
+from unittest import mock
+
+# protonvpn-cli-ng Functions
+from protonvpn_cli import utils as pvpncli_utils
+
+# Local
+from protonvpn_cli_gui.config_cache import pvpn_config
+from protonvpn_cli_gui.update_checker import UpdateChecker
+from tests.http_stand_in import ApiStandIn
+
+PYPI_PATH = '/pypi/protonvpn-cli-gui/json'
+RELEASE = {'info': {'version': '0.2.0'}}
+
+
+class UpdateCheckerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.api = ApiStandIn().start()
+        self.addCleanup(self.api.stop)
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.config_file = os.path.join(self.tmp_dir, 'pvpn-cli.cfg')
+        self.write_config()
+        # Reads and writes go to the temporary config file.
+        for patcher in (
+            mock.patch.object(pvpn_config, 'path', self.config_file),
+            mock.patch.object(
+                pvpncli_utils,
+                'set_config_value',
+                self.set_config_value,
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        pvpn_config.invalidate()
+        self.addCleanup(pvpn_config.invalidate)
+        self.dispatched = []
+        self.updates = []
+        self.checker = UpdateChecker(
+            '0.1.0',
+            lambda callback, *args: self.dispatched.append((callback, args)),
+            url=self.api.url + PYPI_PATH,
+            timeout=0.3,
+        )
+
+    def write_config(self, **metadata):
+        config = ConfigParser()
+        config['USER'] = {'check_update_interval': '3'}
+        config['metadata'] = metadata
+        with open(self.config_file, 'w') as f:
+            config.write(f)
+
+    def set_config_value(self, group, key, value):
+        config = ConfigParser()
+        config.read(self.config_file)
+        config[group][key] = str(value)
+        with open(self.config_file, 'w') as f:
+            config.write(f)
+
+    def run_dispatched(self):
+        """Run the callbacks handed to the UI thread."""
+        dispatched, self.dispatched = self.dispatched, []
+        for callback, args in dispatched:
+            callback(*args)
+
+    def check(self, force=False):
+        thread = self.checker.check(self.updates.append, force=force)
+        if thread:
+            thread.join(5)
+        self.run_dispatched()
+        return thread
+
+    def test_first_check_is_due(self):
+        self.api.respond(PYPI_PATH, body=RELEASE)
+        self.assertTrue(self.checker.is_due())
+        self.assertIsNotNone(self.check())
+        self.assertEqual(self.updates, ['0.2.0'])
+        self.assertEqual(self.api.request_count(PYPI_PATH), 1)
+        # The check is recorded under the GUI's own key.
+        self.assertEqual(self.checker.cached_version(), '0.2.0')
+        last_check = pvpn_config.get_int('metadata', 'last_gui_update_check')
+        self.assertLess(abs(last_check - time()), 5)
+        with self.assertRaises(KeyError):
+            pvpn_config.get('metadata', 'last_update_check')
+        self.assertFalse(self.checker.is_due())
+
+    def test_not_due_reports_cached_version_without_request(self):
+        self.write_config(
+            last_gui_update_check=str(int(time())),
+            latest_gui_version='0.2.0',
+        )
+        self.assertFalse(self.checker.is_due())
+        self.assertIsNone(self.check())
+        self.assertEqual(self.updates, ['0.2.0'])
+        self.assertEqual(self.api.request_count(PYPI_PATH), 0)
+
+    def test_not_due_and_up_to_date(self):
+        self.write_config(
+            last_gui_update_check=str(int(time())),
+            latest_gui_version='0.1.0',
+        )
+        self.check()
+        self.assertEqual(self.updates, [])
+
+    def test_due_after_interval(self):
+        self.write_config(
+            last_gui_update_check=str(int(time()) - 4 * 86400),
+            latest_gui_version='0.1.0',
+        )
+        self.assertTrue(self.checker.is_due())
+
+    def test_force(self):
+        self.api.respond(PYPI_PATH, body={'info': {'version': '0.1.0'}})
+        self.write_config(last_gui_update_check=str(int(time())))
+        self.check(force=True)
+        self.assertEqual(self.api.request_count(PYPI_PATH), 1)
+        self.assertEqual(self.updates, [])
+
+    def test_timeout(self):
+        self.api.respond(PYPI_PATH, body=RELEASE, delay=1)
+        self.check()
+        self.assertEqual(self.updates, [])
+        # Not recorded, so the next launch checks again.
+        self.assertTrue(self.checker.is_due())
+
+    def test_bad_responses(self):
+        for response in ({'body': b'not json'}, {'body': {'info': {}}},
+                         {'status': 500}):
+            with self.subTest(**response):
+                self.api.routes.clear()
+                self.api.respond(PYPI_PATH, **response)
+                self.check()
+                self.assertEqual(self.updates, [])
+                self.assertTrue(self.checker.is_due())
+
+    def test_save_without_metadata_section(self):
+        # First run: set_config_value raises KeyError('metadata').
+        with mock.patch.object(
+            pvpncli_utils,
+            'set_config_value',
+            side_effect=KeyError('metadata'),
+        ):
+            self.checker._save('0.2.0')
+
+
+if __name__ == '__main__':
+    unittest.main()